@@ -18,11 +18,75 @@
 # You should have received a copy of the GNU General Public License
 # along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
 #
+import io
+import json
+import tarfile
 from collections import defaultdict
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
 import pytest
 
+HOTELS: list[dict[str, Any]] = [
+    {
+        "HotelInfo": {"HotelID": "100"},
+        "Reviews": [
+            {
+                "ReviewID": "r1",
+                "Author": "alice",
+                "Ratings": {"Overall": "5.0"},
+                "Date": "January 5, 2008",
+            },
+            {
+                "ReviewID": "r2",
+                "Author": "bob",
+                "Ratings": {"Overall": "3.0"},
+                "Date": "February 2, 2008",
+            },
+            {
+                "ReviewID": "r3",
+                "Author": "carol",
+                "Ratings": {"Overall": "4.0"},
+                "Date": "unknown",
+            },
+        ],
+    },
+    {
+        "HotelInfo": {"HotelID": "200"},
+        "Reviews": [
+            {
+                "ReviewID": "r4",
+                "Author": "dave",
+                "Ratings": {"Overall": "1.0"},
+                "Date": "March 3, 2009",
+            },
+            {
+                "ReviewID": "r5",
+                "Author": "alice",
+                "Ratings": {"Overall": "4.0"},
+                "Date": "December 24, 2007",
+            },
+        ],
+    },
+    {
+        "HotelInfo": {"HotelID": "300"},
+        "Reviews": [
+            {
+                "ReviewID": "r6",
+                "Author": "erin",
+                "Ratings": {"Overall": "2.0"},
+                "Date": "July 14, 2008",
+            },
+        ],
+    },
+]
+"""Hotel objects stored in the archive created by the archive fixture.
+
+As in the real archive, every review has its own ReviewID, and an author
+may post several reviews.
+"""
+
 
 @dataclass(eq=True)
 class Reviewer:
@@ -51,7 +115,7 @@ class Graph:
         if name in self._reviewers:
             raise ValueError("The given reviewer already exists:", name)
 
-        r = Reviewer(name)
+        r = Reviewer(name) if score is None else Reviewer(name, score)
         self._reviewers[name] = r
         return r
 
@@ -92,3 +156,20 @@ class Graph:
 @pytest.fixture
 def graph() -> Graph:
     return Graph()
+
+
+@pytest.fixture
+def archive(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Creates a small dataset archive in a temporary cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = tmp_path.joinpath(
+        "rgmining-tripadvisor-dataset", "TripAdvisorJson.tar.bz2"
+    )
+    path.parent.mkdir()
+    with tarfile.open(path, "w:bz2") as tar:
+        for obj in HOTELS:
+            data = json.dumps(obj).encode()
+            info = tarfile.TarInfo(f"json/{obj['HotelInfo']['HotelID']}.json")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path
@@ -0,0 +1,199 @@
+#
+# test_cache.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import HOTELS
+from tripadvisor import cache
+
+
+def test_build(tmp_path: Path) -> None:
+    """Build a cache and open it."""
+    path = cache.build(HOTELS, tmp_path.joinpath("edges"), {"size": 1})
+    meta = cache.read_meta(path)
+    assert meta is not None
+    assert meta["version"] == cache.VERSION
+    assert meta["source"] == {"size": 1}
+
+    data = cache.open_dataset(path)
+    assert len(data) == 6
+    assert list(data.reviewers) == ["r1", "r2", "r3", "r4", "r5", "r6"]
+    assert list(data.products) == ["100", "200", "300"]
+    assert list(data.reviewer) == [0, 1, 2, 3, 4, 5]
+    assert list(data.product) == [0, 0, 0, 1, 1, 2]
+    assert list(data.score) == [1.0, 0.6, 0.8, 0.2, 0.8, 0.4]
+    assert list(data.date) == [
+        20080105,
+        20080202,
+        0,
+        20090303,
+        20071224,
+        20080714,
+    ]
+
+
+def test_stats(tmp_path: Path) -> None:
+    """Statistics are computed while building a cache."""
+    path = cache.build(HOTELS, tmp_path.joinpath("edges"))
+
+    stats = cache.read_stats(path)
+    assert stats.reviews == 6
+    assert stats.reviewers == 6
+    assert stats.products == 3
+    assert stats.reviewer_degrees == {1: 6}
+    assert stats.product_degrees == {1: 1, 2: 1, 3: 1}
+    assert stats.ratings == {1.0: 1, 2.0: 1, 3.0: 1, 4.0: 2, 5.0: 1}
+    assert stats.first_date == 20071224
+    assert stats.last_date == 20090303
+    assert stats.undated == 1
+    assert cache.Stats.from_json(stats.to_json()) == stats
+
+
+def test_read_meta_missing(tmp_path: Path) -> None:
+    """Incomplete caches don't have metadata."""
+    assert cache.read_meta(tmp_path) is None
+
+
+def test_build_empty(tmp_path: Path) -> None:
+    """An empty dataset can be cached."""
+    data = cache.open_dataset(cache.build([], tmp_path.joinpath("edges")))
+    assert len(data) == 0
+    assert data.stats.first_date is None
+
+
+def test_prune(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Minimum degree filters are applied once."""
+    data = cache.open_dataset(cache.build(HOTELS, tmp_path.joinpath("edges")))
+
+    assert list(cache.prune(data)) == [0, 1, 2, 3, 4, 5]
+    assert list(cache.prune(data, min_product_degree=2)) == [0, 1, 2, 3, 4]
+    assert not caplog.records
+
+    # Every reviewer has one review since reviewers are review IDs.
+    assert list(cache.prune(data, min_reviewer_degree=2)) == []
+    assert "removed every review" in caplog.text
+    assert list(cache.prune(data, [0, 1, 2], min_product_degree=3)) == [
+        0,
+        1,
+        2,
+    ]
+    assert list(cache.prune(data, [0, 1], min_product_degree=3)) == []
+
+
+def test_prune_k_core(tmp_path: Path) -> None:
+    """The k-core filter removes nodes repeatedly."""
+    # Reviewers a and b review both hotels 1 and 2, which form a 2-core;
+    # c reviews 1, 2 and 3, and d reviews only 3.
+    reviews = {
+        "1": ["a", "b", "c"],
+        "2": ["a", "b", "c"],
+        "3": ["c", "d"],
+    }
+    hotels = [
+        {
+            "HotelInfo": {"HotelID": h},
+            "Reviews": [
+                {"ReviewID": r, "Ratings": {"Overall": "3"}, "Date": ""}
+                for r in rs
+            ],
+        }
+        for h, rs in reviews.items()
+    ]
+    data = cache.open_dataset(cache.build(hotels, tmp_path.joinpath("edges")))
+
+    edges = cache.prune(data, k_core=2)
+    assert [
+        (data.products[data.product[i]], data.reviewers[data.reviewer[i]])
+        for i in edges
+    ] == [
+        ("1", "a"),
+        ("1", "b"),
+        ("1", "c"),
+        ("2", "a"),
+        ("2", "b"),
+        ("2", "c"),
+    ]
+    assert list(cache.prune(data, k_core=3)) == []
+
+
+def test_window(tmp_path: Path) -> None:
+    """Edges in a period are selected from the date index."""
+    data = cache.open_dataset(cache.build(HOTELS, tmp_path.joinpath("edges")))
+
+    assert list(data.sorted_date) == sorted(data.date)
+    assert list(data.window()) == [4, 0, 1, 5, 3]
+    assert list(data.window(20080105, 20080714)) == [0, 1, 5]
+    assert list(data.window(since=20080106)) == [1, 5, 3]
+    assert list(data.window(until=20080105)) == [4, 0]
+    assert list(data.window(20100101)) == []
+
+
+def test_partition(tmp_path: Path) -> None:
+    """Shards partition hotels."""
+    data = cache.open_dataset(cache.build(HOTELS, tmp_path.joinpath("edges")))
+
+    assert cache.shard_of("100", 7) == cache.shard_of("100", 7)
+    edges = [list(cache.partition(data, (i, 3))) for i in range(3)]
+    assert sorted(sum(edges, [])) == list(range(len(data)))
+    for i, es in enumerate(edges):
+        assert all(
+            cache.shard_of(data.products[data.product[e]], 3) == i for e in es
+        )
+
+
+def test_merge(tmp_path: Path) -> None:
+    """Merging shards unifies reviewers appearing in several shards."""
+    paths = [
+        cache.build(HOTELS[:1], tmp_path.joinpath("0"), {"size": 1}),
+        cache.build(HOTELS[1:], tmp_path.joinpath("1"), {"size": 1}),
+    ]
+    merged = cache.open_dataset(cache.merge(paths, tmp_path.joinpath("all")))
+    full = cache.open_dataset(cache.build(HOTELS, tmp_path.joinpath("full")))
+
+    assert list(merged.reviewers) == list(full.reviewers)
+    assert list(merged.products) == list(full.products)
+    assert list(merged.reviewer) == list(full.reviewer)
+    assert list(merged.date_order) == list(full.date_order)
+    assert merged.stats == full.stats
+    assert merged.fingerprint == full.fingerprint
+    meta = cache.read_meta(merged.path)
+    assert meta is not None
+    assert meta["source"] == {"size": 1}
+
+
+def test_id_table(tmp_path: Path) -> None:
+    """Lazy ID tables read the same IDs as lists."""
+    path = cache.build(HOTELS, tmp_path.joinpath("edges"))
+
+    data = cache.open_dataset(path, lazy_ids=True)
+    assert isinstance(data.reviewers, cache.IdTable)
+    assert list(data.reviewers) == ["r1", "r2", "r3", "r4", "r5", "r6"]
+    assert list(data.products) == ["100", "200", "300"]
+    assert data.reviewers[-1] == "r6"
+    assert data.reviewers[1:3] == ["r2", "r3"]
+    with pytest.raises(IndexError):
+        data.products[3]
+
+    empty = cache.open_dataset(
+        cache.build([], tmp_path.joinpath("empty")), lazy_ids=True
+    )
+    assert len(empty.reviewers) == 0
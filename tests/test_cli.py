@@ -0,0 +1,205 @@
+#
+# test_cli.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("click")
+
+import click  # noqa: E402
+from click.testing import CliRunner  # noqa: E402
+
+from tripadvisor.cli import SizeType, _windows, main  # noqa: E402
+
+
+def test_stats(archive: Path) -> None:
+    """The stats command prints precomputed statistics."""
+    res = CliRunner().invoke(main, ["stats"])
+    assert res.exit_code == 0, res.output
+
+    stats = json.loads(res.stdout)
+    assert stats["reviews"] == 6
+    assert stats["ratings"]["4.0"] == 2
+
+
+def test_missing_method() -> None:
+    """Running without a method and a command is an error."""
+    res = CliRunner().invoke(main, [])
+    assert res.exit_code != 0
+    assert "--method" in res.output
+
+
+@pytest.mark.parametrize("option", ["--k-core", "--min-reviewer-degree"])
+def test_reviewer_degree(archive: Path, option: str) -> None:
+    """Reviewer degrees no reviewer has are rejected."""
+    res = CliRunner().invoke(main, ["-m", "rsd", option, "2"])
+    assert res.exit_code == 2
+    assert "review IDs" in res.output
+
+    res = CliRunner().invoke(main, ["-m", "rsd", option, "1"])
+    assert res.exit_code == 0, res.output
+
+
+def test_sliding_windows() -> None:
+    """Sliding windows cover a given period."""
+    assert list(_windows(20080101, 20080110, 4, 3)) == [
+        (20080101, 20080104),
+        (20080104, 20080107),
+        (20080107, 20080110),
+    ]
+    assert list(_windows(20080228, 20080302, 7, 7)) == [
+        (20080228, 20080302),
+    ]
+
+
+def test_windows(archive: Path) -> None:
+    """The windows command labels outputs with windows."""
+    pytest.importorskip("rsd")
+    res = CliRunner().invoke(
+        main,
+        ["windows", "-m", "rsd", "--loop", "1", "--width", "365"],
+    )
+    assert res.exit_code == 0, res.output
+
+    windows: dict[tuple[int, int], set[str]] = {}
+    for line in res.stdout.splitlines():
+        obj = json.loads(line)
+        if "reviewer" in obj:
+            key = (obj["window"]["since"], obj["window"]["until"])
+            windows.setdefault(key, set()).add(obj["reviewer"]["reviewer_id"])
+    assert windows == {
+        (20071224, 20081222): {"r1", "r2", "r5", "r6"},
+        (20081223, 20090303): {"r4"},
+    }
+
+
+def test_db(archive: Path, tmp_path: Path) -> None:
+    """Results stored in a database can be queried."""
+    pytest.importorskip("rsd")
+    db = str(tmp_path.joinpath("results.db"))
+    runner = CliRunner()
+    res = runner.invoke(main, ["-m", "rsd", "--loop", "2", "--db", db])
+    assert res.exit_code == 0, res.output
+    assert res.stdout == ""
+
+    res = runner.invoke(main, ["query", db, "--reviewer", "r1"])
+    assert res.exit_code == 0, res.output
+    iterations = [
+        json.loads(line)["iteration"] for line in res.stdout.splitlines()
+    ]
+    assert iterations[0] == 0
+    assert iterations[-1] == "final"
+
+    res = runner.invoke(main, ["query", db, "--iteration", "final"])
+    ids = {
+        obj.get("reviewer_id") or obj.get("product_id")
+        for obj in map(json.loads, res.stdout.splitlines())
+    }
+    assert ids == {
+        "r1",
+        "r2",
+        "r3",
+        "r4",
+        "r5",
+        "r6",
+        "100",
+        "200",
+        "300",
+    }
+
+    res = runner.invoke(main, ["-m", "rsd", "--loop", "1", "--db", db])
+    assert res.exit_code == 0, res.output
+    res = runner.invoke(main, ["query", db])
+    runs = [json.loads(line) for line in res.stdout.splitlines()]
+    assert [(obj["run"], obj["label"]) for obj in runs] == [(1, ""), (2, "")]
+    assert runs[0]["iterations"][-1] == "final"
+
+    res = runner.invoke(main, ["query", db, "--reviewer", "r1"])
+    assert len(res.stdout.splitlines()) < len(iterations)
+    res = runner.invoke(main, ["query", db, "--reviewer", "r1", "--run", "1"])
+    assert len(res.stdout.splitlines()) == len(iterations)
+
+
+def test_index(archive: Path, tmp_path: Path) -> None:
+    """JSON lines written by a run can be indexed."""
+    pytest.importorskip("rsd")
+    output = str(tmp_path.joinpath("output.jsonl"))
+    db = str(tmp_path.joinpath("results.db"))
+    runner = CliRunner()
+    res = runner.invoke(main, ["-m", "rsd", "--loop", "1", "--output", output])
+    assert res.exit_code == 0, res.output
+
+    res = runner.invoke(main, ["index", output, db])
+    assert res.exit_code == 0, res.output
+    res = runner.invoke(main, ["query", db])
+    assert json.loads(res.stdout) == {
+        "run": 1,
+        "label": "",
+        "iterations": [0, 1, "final"],
+    }
+
+
+def test_size_type() -> None:
+    """Sizes are parsed with optional units."""
+    size = SizeType()
+    assert size.convert("1024", None, None) == 1024
+    assert size.convert("512M", None, None) == 512 << 20
+    assert size.convert("1.5g", None, None) == 3 << 29
+    assert size.convert("2KB", None, None) == 2048
+    with pytest.raises(click.BadParameter):
+        size.convert("lots", None, None)
+
+
+def test_memory_budget_exceeded(archive: Path) -> None:
+    """Loading beyond the memory budget fails with a report."""
+    pytest.importorskip("rsd")
+    res = CliRunner().invoke(main, ["-m", "rsd", "--memory-budget", "1K"])
+    assert res.exit_code == 1
+    assert "Out of the memory budget" in res.output
+
+
+def test_warm_start(archive: Path, tmp_path: Path) -> None:
+    """A run starts from the final scores of a previous run."""
+    pytest.importorskip("rsd")
+    previous = tmp_path.joinpath("previous.jsonl")
+    previous.write_text(
+        json.dumps(
+            {
+                "iteration": "final",
+                "reviewer": {"reviewer_id": "r1", "score": 0.9},
+            }
+        )
+        + "\n"
+    )
+    res = CliRunner().invoke(
+        main, ["-m", "rsd", "--loop", "1", "--warm-start", str(previous)]
+    )
+    assert res.exit_code == 0, res.output
+
+    first = [json.loads(line) for line in res.stdout.splitlines()]
+    scores = {
+        obj["reviewer"]["reviewer_id"]: obj["reviewer"]["score"]
+        for obj in first
+        if obj["iteration"] == 0 and "reviewer" in obj
+    }
+    assert scores["r1"] == 0.9
+    assert scores["r2"] != 0.9
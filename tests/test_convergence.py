@@ -0,0 +1,103 @@
+#
+# test_convergence.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+from collections.abc import Iterable
+
+from tripadvisor.convergence import Convergence, StopReason
+
+
+def iterate(monitor: Convergence, diffs: Iterable[float | None]) -> int:
+    """Feeds diffs to a monitor and returns the number of iterations."""
+    it = iter(diffs)
+    while monitor.proceed():
+        if monitor.update(next(it)):
+            break
+    return monitor.iterations
+
+
+def test_loop() -> None:
+    monitor = Convergence(3)
+    assert iterate(monitor, [1.0, 0.5, 0.25, 0.1]) == 3
+    assert monitor.reason == StopReason.LOOP
+    assert not monitor.proceed()
+
+
+def test_absolute_tolerance() -> None:
+    monitor = Convergence(10, atol=0.1)
+    assert iterate(monitor, [1.0, 0.5, 0.1, 0.01]) == 3
+    assert monitor.reason == StopReason.CONVERGED
+
+
+def test_relative_tolerance() -> None:
+    monitor = Convergence(10, atol=0.0, rtol=0.01)
+    assert iterate(monitor, [200.0, 50.0, 10.0, 2.0, 1.0]) == 4
+    assert monitor.reason == StopReason.CONVERGED
+
+
+def test_no_diffs() -> None:
+    monitor = Convergence(4)
+    assert iterate(monitor, [None] * 4) == 4
+    assert monitor.reason == StopReason.LOOP
+
+
+def test_stalled() -> None:
+    monitor = Convergence(20, patience=3)
+    assert iterate(monitor, [1.0, 0.5, 0.499, 0.498, 0.4975, 0.1]) == 5
+    assert monitor.reason == StopReason.STALLED
+
+
+def test_not_stalled() -> None:
+    """Diffs rising or falling steadily are neither stalled nor oscillating."""
+    monitor = Convergence(8, patience=3)
+    assert iterate(monitor, [0.1, 0.2, 0.4, 0.8, 1.6, 0.8, 0.4, 0.2]) == 8
+    assert monitor.reason == StopReason.LOOP
+
+    monitor = Convergence(8, patience=3)
+    assert iterate(monitor, [1.0, 0.5, 0.7, 0.4, 0.6, 0.3, 0.5, 0.2]) == 8
+    assert monitor.reason == StopReason.LOOP
+
+
+def test_oscillating() -> None:
+    monitor = Convergence(20, patience=3)
+    assert iterate(monitor, [1.0, 0.5, 0.7, 0.5, 0.7, 0.1]) == 5
+    assert monitor.reason == StopReason.OSCILLATING
+
+
+def test_patience_disabled() -> None:
+    monitor = Convergence(6)
+    assert iterate(monitor, [1.0, 0.5, 0.5, 0.5, 0.5, 0.5]) == 6
+    assert monitor.reason == StopReason.LOOP
+
+
+def test_time_budget() -> None:
+    now = [0.0]
+
+    def diffs() -> Iterable[float]:
+        # Each iteration takes 3 seconds.
+        while True:
+            now[0] += 3.0
+            yield 1.0
+
+    monitor = Convergence(
+        100, patience=0, time_budget=10.0, clock=lambda: now[0]
+    )
+    assert iterate(monitor, diffs()) == 3
+    assert monitor.reason == StopReason.TIME_BUDGET
+    assert monitor.elapsed == 9.0
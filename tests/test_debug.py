@@ -19,9 +19,11 @@
 # along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
 #
 import io
+from array import array
+from collections.abc import Sequence
 
 from tests.conftest import Graph
-from tripadvisor.debug import print_state
+from tripadvisor.debug import BulkScores, print_state, print_top
 
 
 def test_print_state(graph: Graph) -> None:
@@ -49,3 +51,73 @@ def test_print_state(graph: Graph) -> None:
 {"iteration": 9, "product": {"product_id": "product-2", "summary": 0.0}}
 """
     )
+
+
+def test_print_top(graph: Graph) -> None:
+    reviewers = [graph.new_reviewer(f"reviewer-{i}") for i in range(1, 5)]
+    for r, score in zip(reviewers, [0.3, 0.9, 0.1, 0.5]):
+        r.anomalous_score = score
+    graph.new_product("product-1")
+
+    output = io.StringIO()
+    print_top(graph, "final", 2, output)
+
+    assert (
+        output.getvalue()
+        == """{"iteration": "final", "reviewer": {"reviewer_id": "reviewer-2", "score": 0.9}}
+{"iteration": "final", "reviewer": {"reviewer_id": "reviewer-4", "score": 0.5}}
+"""
+    )
+
+    output = io.StringIO()
+    print_top(graph, 3, 1, output, products=True)
+
+    assert (
+        output.getvalue()
+        == """{"iteration": 3, "reviewer": {"reviewer_id": "reviewer-2", "score": 0.9}}
+{"iteration": 3, "product": {"product_id": "product-1", "summary": 0.0}}
+"""
+    )
+
+
+class BulkGraph(Graph):
+    """A graph returning scores in bulk."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def reviewer_scores(self) -> tuple[Sequence[str], Sequence[float]]:
+        self.calls += 1
+        return ["reviewer-1", "reviewer-2"], array("d", [0.25, 0.75])
+
+    def product_summaries(self) -> tuple[Sequence[str], Sequence[float]]:
+        self.calls += 1
+        return ["product-1"], array("d", [0.5])
+
+
+def test_bulk_scores() -> None:
+    """Graphs implementing BulkScores are read in bulk."""
+    graph = BulkGraph()
+    assert isinstance(graph, BulkScores)
+    assert not isinstance(Graph(), BulkScores)
+
+    output = io.StringIO()
+    print_state(graph, 1, output)
+    assert graph.calls == 2
+    assert (
+        output.getvalue()
+        == """{"iteration": 1, "reviewer": {"reviewer_id": "reviewer-1", "score": 0.25}}
+{"iteration": 1, "reviewer": {"reviewer_id": "reviewer-2", "score": 0.75}}
+{"iteration": 1, "product": {"product_id": "product-1", "summary": 0.5}}
+"""
+    )
+
+    output = io.StringIO()
+    print_top(graph, 2, 1, output)
+    assert graph.calls == 3
+    assert (
+        output.getvalue()
+        == """{"iteration": 2, "reviewer": {"reviewer_id": "reviewer-2", "score": 0.75}}
+"""
+    )
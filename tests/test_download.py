@@ -0,0 +1,212 @@
+#
+# test_download.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import os
+import re
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from tripadvisor import download as download_module
+from tripadvisor.download import IncompleteDownload, download
+
+DATA = os.urandom(100_000)
+
+
+class FileServer(ThreadingHTTPServer):
+    """A server of DATA recording range requests."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, ranges: bool = True, size: bool = True, failures: int = 0
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.ranges = ranges
+        self.size = size
+        self.failures = failures
+        self.requests: list[str | None] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/data"
+
+    def fail(self) -> bool:
+        """Returns True if the current request should break off."""
+        with self.lock:
+            if self.failures > 0:
+                self.failures -= 1
+                return True
+            return False
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: FileServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        header = self.headers.get("Range")
+        with self.server.lock:
+            self.server.requests.append(header)
+        m = re.fullmatch(r"bytes=(\d+)-(\d+)", header or "")
+        if not self.server.ranges or m is None:
+            if self.server.fail():
+                self._send(200, DATA[:1000], {}, length=len(DATA))
+                self.close_connection = True
+                return
+            self._send(200, DATA, {})
+            return
+        start, end = int(m.group(1)), int(m.group(2))
+        body = DATA[start : end + 1]
+        if not self.server.size:
+            self._send(206, body, {"Content-Range": f"bytes {start}-{end}/*"})
+            return
+        if start > 0 and self.server.fail():
+            # Announce the whole segment but send only half of it.
+            self._send(
+                206,
+                body[: len(body) // 2],
+                {"Content-Range": f"bytes {start}-{end}/{len(DATA)}"},
+                length=len(body),
+            )
+            self.close_connection = True
+            return
+        self._send(
+            206, body, {"Content-Range": f"bytes {start}-{end}/{len(DATA)}"}
+        )
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        headers: dict[str, str],
+        length: int | None = None,
+    ) -> None:
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(length or len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve(**kwargs: Any) -> Iterator[FileServer]:
+    server = FileServer(**kwargs)
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server() -> Iterator[FileServer]:
+    yield from serve()
+
+
+def test_segments(server: FileServer, tmp_path: Path) -> None:
+    """Segments are fetched with range requests and assembled in place."""
+    path = download(
+        server.url,
+        tmp_path.joinpath("data"),
+        segments=4,
+        min_segment_size=10_000,
+    )
+    assert path.read_bytes() == DATA
+    assert not tmp_path.joinpath("data.part").exists()
+    assert len(server.requests) == 5
+    assert set(server.requests) == {
+        "bytes=0-0",
+        "bytes=0-24999",
+        "bytes=25000-49999",
+        "bytes=50000-74999",
+        "bytes=75000-99999",
+    }
+
+
+def test_retry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Broken segments are resumed from the last byte written."""
+    monkeypatch.setattr(download_module, "_CHUNK_SIZE", 1000)
+    for server in serve(failures=2):
+        path = download(
+            server.url,
+            tmp_path.joinpath("data"),
+            segments=4,
+            min_segment_size=10_000,
+            backoff=0,
+        )
+        assert path.read_bytes() == DATA
+        assert len(server.requests) == 7
+        starts = {
+            int(str(v).split("=")[1].split("-")[0]) for v in server.requests
+        }
+        assert len(starts - {0, 25000, 50000, 75000}) == 2
+
+
+def test_retry_exhausted(tmp_path: Path) -> None:
+    """Downloading fails when a segment keeps failing."""
+    for server in serve(failures=100):
+        with pytest.raises(IncompleteDownload):
+            download(
+                server.url,
+                tmp_path.joinpath("data"),
+                segments=2,
+                min_segment_size=10_000,
+                retries=1,
+                backoff=0,
+            )
+    assert not tmp_path.joinpath("data").exists()
+
+
+def test_no_ranges(tmp_path: Path) -> None:
+    """Servers not supporting ranges are read as a single stream."""
+    for server in serve(ranges=False):
+        path = download(server.url, tmp_path.joinpath("data"), segments=4)
+        assert path.read_bytes() == DATA
+        assert server.requests == ["bytes=0-0"]
+
+
+def test_unknown_size(tmp_path: Path) -> None:
+    """Files of unknown sizes are requested without ranges."""
+    for server in serve(size=False):
+        path = download(server.url, tmp_path.joinpath("data"), segments=4)
+        assert path.read_bytes() == DATA
+        assert server.requests == ["bytes=0-0", None]
+
+
+def test_truncated_stream(tmp_path: Path) -> None:
+    """A single stream ending early is not taken for the file."""
+    for server in serve(ranges=False, failures=1):
+        with pytest.raises((IncompleteDownload, requests.RequestException)):
+            download(server.url, tmp_path.joinpath("data"))
+    assert not tmp_path.joinpath("data").exists()
@@ -18,12 +18,22 @@
 # You should have received a copy of the GNU General Public License
 # along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
 #
+import asyncio
+import io
+import json
 import os
+import tarfile
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
 
 import pytest
 
 import tripadvisor
-from tests.conftest import Graph
+from tests.conftest import HOTELS, Graph
+from tripadvisor import cache, loader, memory
 
 
 @pytest.mark.skipif(
@@ -40,3 +50,316 @@ def test_load(graph: Graph) -> None:
     for pmap in graph.reviews.values():
         for score in pmap.values():
             assert 0 <= score <= 1
+
+
+def test_load_archive(archive: Path, graph: Graph) -> None:
+    """Load a graph from a local archive through the edge cache."""
+    assert tripadvisor.load(graph) == graph
+
+    assert [p.name for p in graph.products] == ["100", "200", "300"]
+    assert [r.name for r in graph.reviewers] == [
+        "r1",
+        "r2",
+        "r3",
+        "r4",
+        "r5",
+        "r6",
+    ]
+    assert graph.reviews["r1"] == {"100": 1.0}
+    assert graph.reviews["r5"] == {"200": 0.8}
+    assert archive.parent.joinpath(loader.EDGES_DIRNAME).exists()
+
+
+def test_stats(archive: Path) -> None:
+    """Statistics are read from the edge cache."""
+    stats = tripadvisor.stats()
+    assert stats.reviews == 6
+    assert stats.products == 3
+
+
+def test_rebuild(archive: Path) -> None:
+    """The edge cache is rebuilt when the archive is replaced."""
+    assert len(tripadvisor.dataset()) == 6
+
+    with tarfile.open(archive, "w:bz2"):
+        pass
+    assert len(tripadvisor.dataset()) == 0
+
+
+def test_load_pruned(archive: Path, graph: Graph) -> None:
+    """Only reviewers and hotels having surviving reviews are created."""
+    tripadvisor.load(graph, min_product_degree=2)
+
+    assert [p.name for p in graph.products] == ["100", "200"]
+    assert [r.name for r in graph.reviewers] == ["r1", "r2", "r3", "r4", "r5"]
+
+
+def test_load_window(archive: Path, graph: Graph) -> None:
+    """Only reviews posted in a given period are loaded."""
+    tripadvisor.load(graph, since=20080101, until=20081231)
+
+    assert graph.reviews == {
+        "r1": {"100": 1.0},
+        "r2": {"100": 0.6},
+        "r6": {"300": 0.4},
+    }
+
+
+def test_load_shard(archive: Path, graph: Graph) -> None:
+    """Only hotels in a given shard are loaded."""
+    tripadvisor.load(graph, shard=(cache.shard_of("200", 2), 2))
+    assert "200" in [p.name for p in graph.products]
+    assert all(
+        cache.shard_of(p.name, 2) == cache.shard_of("200", 2)
+        for p in graph.products
+    )
+
+
+def test_reviews_shard(archive: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only members of a given shard are parsed."""
+    parsed: list[str] = []
+    load = loader.json.load
+
+    def spy(fp: Any) -> Any:
+        obj = load(fp)
+        parsed.append(obj["HotelInfo"]["HotelID"])
+        return obj
+
+    monkeypatch.setattr(loader.json, "load", spy)
+    shard = (cache.shard_of("200", 2), 2)
+    hotels = [
+        obj["HotelInfo"]["HotelID"] for obj in tripadvisor.reviews(shard)
+    ]
+    assert hotels == [
+        h["HotelInfo"]["HotelID"]
+        for h in HOTELS
+        if cache.shard_of(h["HotelInfo"]["HotelID"], 2) == shard[0]
+    ]
+    assert parsed == hotels
+
+    # Members not named after hotels are parsed to find their shards.
+    with tarfile.open(archive, "w:bz2") as tar:
+        for i, obj in enumerate(HOTELS):
+            data = json.dumps(obj).encode()
+            info = tarfile.TarInfo(f"json/hotel-{i}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    parsed.clear()
+    assert [
+        obj["HotelInfo"]["HotelID"] for obj in tripadvisor.reviews(shard)
+    ] == hotels
+    assert len(parsed) == len(HOTELS)
+
+
+def edge_set(data: cache.Dataset) -> set[tuple[str, str, float, int]]:
+    """Returns the edges of a dataset as a set of tuples."""
+    return {
+        (data.reviewers[r], data.products[p], s, d)
+        for r, p, s, d in zip(
+            data.reviewer, data.product, data.score, data.date
+        )
+    }
+
+
+def count_reviews(_: int) -> int:
+    """Returns the number of reviews of the dataset in a worker process."""
+    return len(tripadvisor.dataset())
+
+
+def test_concurrent_build(archive: Path) -> None:
+    """Processes loading the dataset at the same time share one cache."""
+    n = 8
+    with ProcessPoolExecutor(n) as executor:
+        assert list(executor.map(count_reviews, range(n))) == [6] * n
+
+    assert [p.name for p in archive.parent.iterdir() if p.is_dir()] == [
+        loader.EDGES_DIRNAME
+    ]
+    assert cache.read_meta(archive.parent.joinpath(loader.EDGES_DIRNAME))
+
+
+def test_export_and_merge(archive: Path, tmp_path: Path) -> None:
+    """Shards exported by several processes are merged into the dataset."""
+    n = 3
+    paths = [tmp_path.joinpath(f"shard-{i}") for i in range(n)]
+    with ProcessPoolExecutor(n) as executor:
+        list(
+            executor.map(tripadvisor.export, paths, [(i, n) for i in range(n)])
+        )
+
+    hotels = [list(cache.open_dataset(p).products) for p in paths]
+    assert sorted(sum(hotels, [])) == ["100", "200", "300"]
+
+    merged = tripadvisor.merge(paths)
+    assert merged == archive.parent.joinpath(loader.EDGES_DIRNAME)
+
+    full = cache.build(HOTELS, tmp_path.joinpath("full"))
+    assert edge_set(tripadvisor.dataset()) == edge_set(
+        cache.open_dataset(full)
+    )
+
+
+def test_load_memory_budget(
+    archive: Path, graph: Graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Loading within a memory budget builds the same graph."""
+    tripadvisor.load(graph, memory_budget=1 << 40)
+    assert graph.reviews["r5"] == {"200": 0.8}
+
+    # The ID tables don't fit.
+    loader._open.cache_clear()
+    monkeypatch.setattr(memory, "rss", lambda: 1000)
+    opened: list[bool] = []
+    monkeypatch.setattr(cache, "open_dataset", spy(cache.open_dataset, opened))
+    low = Graph()
+    tripadvisor.load(low, memory_budget=1001)
+    assert opened == [True]
+    assert low.reviews == graph.reviews
+    assert [r.name for r in low.reviewers] == [r.name for r in graph.reviewers]
+
+
+def test_load_memory_budget_switch(
+    archive: Path, graph: Graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Loading switches to the low-memory mode when usage grows."""
+    tripadvisor.dataset()
+    values = iter([0, 0, 0, 2000])
+    monkeypatch.setattr(memory, "rss", lambda: next(values, 0))
+    opened: list[bool] = []
+    monkeypatch.setattr(cache, "open_dataset", spy(cache.open_dataset, opened))
+    loader._open.cache_clear()
+    tripadvisor.load(graph, memory_budget=1000)
+    assert opened == [False, True]
+    assert graph.reviews["r5"] == {"200": 0.8}
+
+
+def test_load_memory_budget_exceeded(
+    archive: Path, graph: Graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Loading fails fast when even the low-memory mode doesn't fit."""
+    tripadvisor.dataset()
+    monkeypatch.setattr(memory, "rss", lambda: 2000)
+    with pytest.raises(memory.MemoryBudgetExceeded, match="6 reviews"):
+        tripadvisor.load(graph, memory_budget=1000)
+    assert len(graph.reviews) == 0
+
+
+def test_build_memory_budget_exceeded(
+    archive: Path, graph: Graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Building the edge cache fails once it exceeds the memory budget."""
+    usage = iter([0, 0, 2000])
+    monkeypatch.setattr(memory, "rss", lambda: next(usage, 2000))
+    with pytest.raises(
+        memory.MemoryBudgetExceeded, match="after parsing 5 reviews"
+    ):
+        tripadvisor.load(graph, memory_budget=1000)
+    assert (
+        cache.read_meta(archive.parent.joinpath(loader.EDGES_DIRNAME)) is None
+    )
+
+
+def spy(
+    func: Callable[..., cache.Dataset], calls: list[bool]
+) -> Callable[..., cache.Dataset]:
+    """Wraps open_dataset to record whether ID tables are lazy."""
+
+    def _(path: Path, lazy_ids: bool = False) -> cache.Dataset:
+        calls.append(lazy_ids)
+        return func(path, lazy_ids)
+
+    return _
+
+
+def test_areviews(archive: Path) -> None:
+    """Hotels are parsed in a worker thread and yielded asynchronously."""
+
+    async def collect() -> list[dict[str, Any]]:
+        return [obj async for obj in tripadvisor.areviews(buffer=1)]
+
+    assert asyncio.run(collect()) == HOTELS
+
+
+def test_areviews_close(
+    archive: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Closing the iteration early stops the worker thread."""
+    closed = threading.Event()
+
+    def hotels(_shard: tuple[int, int] | None) -> Iterator[dict[str, Any]]:
+        try:
+            yield from HOTELS * 100
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(loader, "reviews", hotels)
+
+    async def first() -> dict[str, Any]:
+        it = tripadvisor.areviews(buffer=2)
+        obj = await anext(it)
+        await it.aclose()
+        return obj
+
+    assert asyncio.run(first()) == HOTELS[0]
+    assert closed.is_set()
+
+
+def test_areviews_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Errors in the worker thread are raised to the consumer."""
+
+    def broken(_shard: tuple[int, int] | None) -> Iterator[dict[str, Any]]:
+        yield HOTELS[0]
+        raise OSError("broken archive")
+
+    monkeypatch.setattr(loader, "reviews", broken)
+
+    async def collect() -> list[dict[str, Any]]:
+        return [obj async for obj in tripadvisor.areviews()]
+
+    with pytest.raises(OSError, match="broken archive"):
+        asyncio.run(collect())
+
+
+def test_aload(archive: Path, graph: Graph) -> None:
+    """Edges are added in batches while the event loop keeps running."""
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def collect() -> list[list[int]]:
+        ticker = asyncio.create_task(tick())
+        batches = [
+            list(b)
+            async for b in tripadvisor.aload(
+                graph, batch_size=4, min_product_degree=2
+            )
+        ]
+        ticker.cancel()
+        return batches
+
+    batches = asyncio.run(collect())
+    assert [len(b) for b in batches] == [4, 1]
+    assert ticks >= len(batches)
+
+    expect = Graph()
+    tripadvisor.load(expect, min_product_degree=2)
+    assert graph.reviews == expect.reviews
+
+
+def test_load_anomalous_scores(archive: Path, graph: Graph) -> None:
+    """Reviewers are created with given initial scores."""
+    tripadvisor.load(graph, anomalous_scores={"r1": 0.9, "r4": 0.2})
+
+    scores = {r.name: r.anomalous_score for r in graph.reviewers}
+    assert scores == {
+        "r1": 0.9,
+        "r2": 0.0,
+        "r3": 0.0,
+        "r4": 0.2,
+        "r5": 0.0,
+        "r6": 0.0,
+    }
@@ -0,0 +1,87 @@
+#
+# test_memory.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import pytest
+
+from tripadvisor import memory
+
+
+class FakeUsage:
+    """A fake resident set size set by tests."""
+
+    def __init__(self) -> None:
+        self.value = 1000
+
+    def __call__(self) -> int:
+        return self.value
+
+
+@pytest.fixture
+def usage(monkeypatch: pytest.MonkeyPatch) -> FakeUsage:
+    fake = FakeUsage()
+    monkeypatch.setattr(memory, "rss", fake)
+    return fake
+
+
+def test_rss() -> None:
+    """Memory usage of this process is measured."""
+    assert memory.rss() > 0
+    assert memory.peak_rss() > 0
+
+
+def test_fits(usage: FakeUsage) -> None:
+    """Allocations are checked against the current usage."""
+    guard = memory.MemoryGuard(1500)
+    assert guard.fits(500)
+    assert not guard.fits(501)
+
+
+def test_check(usage: FakeUsage) -> None:
+    """Usage after loading all edges is projected from the growth so far."""
+    guard = memory.MemoryGuard(2000, interval=10)
+    assert guard.check(0, 100)
+
+    # 10 bytes per edge projects 1100 + 900 bytes.
+    usage.value = 1100
+    assert guard.check(10, 100)
+    assert guard.projected == 2000
+
+    # Not sampled between intervals.
+    usage.value = 3000
+    assert guard.check(15, 100)
+
+    # 15 bytes per edge projects 1300 + 1200 bytes.
+    usage.value = 1300
+    assert not guard.check(20, 100)
+    assert guard.projected == 2500
+    assert guard.peak == 1300
+    assert "loaded 20 reviews" in guard.report(20, 100)
+
+
+def test_reset(usage: FakeUsage) -> None:
+    """Projection restarts from the usage at a reset."""
+    guard = memory.MemoryGuard(2000, interval=10)
+    usage.value = 1500
+    guard.reset(5)
+    assert guard.check(5, 100)
+
+    usage.value = 1510
+    assert guard.check(15, 100)
+    assert guard.projected == 1510 + 85
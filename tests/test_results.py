@@ -0,0 +1,152 @@
+#
+# test_results.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import io
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import Graph
+from tripadvisor import results
+from tripadvisor.debug import print_state
+from tripadvisor.results import ResultStore, read_scores
+
+
+def make_graph(graph: Graph) -> Graph:
+    reviewers = [graph.new_reviewer(f"reviewer-{i}") for i in range(1, 4)]
+    for r, score in zip(reviewers, [0.3, 0.9, 0.1]):
+        r.anomalous_score = score
+    graph.new_product("product-1").summary = 0.5
+    return graph
+
+
+def test_write_and_query(tmp_path: Path, graph: Graph) -> None:
+    make_graph(graph)
+    path = tmp_path.joinpath("results.db")
+    with ResultStore(path) as store:
+        store.write_state(graph, 0)
+        graph.reviewers[0].anomalous_score = 0.7
+        store.write_state(graph, 1)
+        store.write_state(graph, "final", top=1, products=False)
+        store.write_state(graph, "final", window={"since": 1, "until": 2})
+
+    with ResultStore(path) as store:
+        assert store.labels() == ["", '{"window": {"since": 1, "until": 2}}']
+        assert store.iterations() == [0, 1, "final"]
+        assert store.trajectory("reviewer-1") == [(0, 0.3), (1, 0.7)]
+        assert len(store.trajectory("reviewer-1", None)) == 3
+        assert store.scores(1) == {
+            "reviewer-1": 0.7,
+            "reviewer-2": 0.9,
+            "reviewer-3": 0.1,
+        }
+        assert store.scores("final") == {"reviewer-2": 0.9}
+        assert store.summaries(0) == {"product-1": 0.5}
+        assert store.summaries("final") == {}
+        assert store.product_trajectory("product-1") == [(0, 0.5), (1, 0.5)]
+
+
+def test_runs(tmp_path: Path, graph: Graph) -> None:
+    """Outputs of runs with the same labels aren't mixed."""
+    make_graph(graph)
+    path = tmp_path.joinpath("results.db")
+    with ResultStore(path) as store:
+        assert store.run is None
+        store.write_state(graph, 0)
+        store.write_state(graph, "final")
+        first = store.run
+    graph.reviewers[0].anomalous_score = 0.7
+    with ResultStore(path) as store:
+        store.write_state(graph, 0)
+        second = store.run
+
+    with ResultStore(path) as store:
+        assert store.runs() == [first, second]
+        assert store.iterations() == [0]
+        assert store.iterations(run=first) == [0, "final"]
+        assert store.scores(0)["reviewer-1"] == 0.7
+        assert store.scores(0, run=first)["reviewer-1"] == 0.3
+        assert store.trajectory("reviewer-1") == [(0, 0.7)]
+        assert store.trajectory("reviewer-1", run=first) == [
+            (0, 0.3),
+            ("final", 0.3),
+        ]
+        assert store.product_trajectory("product-1", run=second) == [(0, 0.5)]
+        assert store.labels(first) == [""]
+
+
+def test_import_jsonl(tmp_path: Path, graph: Graph) -> None:
+    make_graph(graph)
+    output = io.StringIO()
+    print_state(graph, 0, output)
+    print_state(graph, "final", output, window={"since": 1, "until": 2})
+    output.seek(0)
+
+    with ResultStore(tmp_path.joinpath("results.db")) as store:
+        assert store.import_jsonl(output) == 8
+        assert store.scores(0) == {
+            "reviewer-1": 0.3,
+            "reviewer-2": 0.9,
+            "reviewer-3": 0.1,
+        }
+        assert store.iterations('{"window": {"since": 1, "until": 2}}') == [
+            "final"
+        ]
+
+
+def test_import_jsonl_batches(
+    tmp_path: Path, graph: Graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Large inputs are imported in batches."""
+    monkeypatch.setattr(results, "_BATCH_SIZE", 2)
+    make_graph(graph)
+    output = io.StringIO()
+    for i in range(3):
+        print_state(graph, i, output)
+    output.seek(0)
+
+    with ResultStore(tmp_path.joinpath("results.db")) as store:
+        assert store.import_jsonl(output) == 12
+        assert store.iterations() == [0, 1, 2]
+        assert store.trajectory("reviewer-2") == [(0, 0.9), (1, 0.9), (2, 0.9)]
+        assert store.product_trajectory("product-1") == [
+            (0, 0.5),
+            (1, 0.5),
+            (2, 0.5),
+        ]
+
+
+def test_read_scores(graph: Graph) -> None:
+    """The last score of each reviewer is read."""
+    make_graph(graph)
+    output = io.StringIO()
+    print_state(graph, 0, output)
+    later = Graph()
+    later.new_reviewer("reviewer-1", 0.7)
+    later.new_reviewer("reviewer-4", 0.2)
+    print_state(later, "final", output, window={"since": 1, "until": 2})
+    output.seek(0)
+
+    assert read_scores(output) == {
+        "reviewer-1": 0.7,
+        "reviewer-2": 0.9,
+        "reviewer-3": 0.1,
+        "reviewer-4": 0.2,
+    }
@@ -0,0 +1,98 @@
+#
+# test_sampling.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import random
+from collections import Counter
+from pathlib import Path
+
+import tripadvisor
+from tests.conftest import HOTELS, Graph
+from tripadvisor import cache, sampling
+
+
+def test_reservoir() -> None:
+    """Samples are reproducible, ordered, and uniform."""
+    sample = sampling.reservoir(range(100), 10, random.Random(1))
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert sampling.reservoir(range(100), 10, random.Random(1)) == sample
+    assert sampling.reservoir(range(5), 10, random.Random(1)) == list(range(5))
+
+    counts = Counter[int]()
+    rng = random.Random(0)
+    for _ in range(2000):
+        counts.update(sampling.reservoir(range(10), 3, rng))
+    assert all(500 < counts[i] < 700 for i in range(10))
+
+
+def test_sample_reviews() -> None:
+    """Hotels without sampled reviews are dropped."""
+    sample = list(sampling.sample_reviews(HOTELS, 0.5, random.Random(3)))
+    assert list(sampling.sample_reviews(HOTELS, 0.5, random.Random(3))) == (
+        sample
+    )
+    assert all(obj["Reviews"] for obj in sample)
+    assert list(sampling.sample_reviews(HOTELS, 1, random.Random(0))) == (
+        HOTELS
+    )
+
+
+def test_sample_products(tmp_path: Path) -> None:
+    """All edges of sampled hotels are selected."""
+    data = cache.open_dataset(cache.build(HOTELS, tmp_path))
+    edges = sampling.sample_products(data, 2, random.Random(0))
+
+    products = {data.product[i] for i in edges}
+    assert len(products) == 2
+    assert list(edges) == [
+        i for i in range(len(data)) if data.product[i] in products
+    ]
+
+
+def test_sample_edges(tmp_path: Path) -> None:
+    """A given fraction of edges is selected in order."""
+    data = cache.open_dataset(cache.build(HOTELS, tmp_path))
+    edges = sampling.sample_edges(data, 0.5, random.Random(0))
+    assert len(edges) == 3
+    assert list(edges) == sorted(edges)
+    assert sampling.sample_edges(data, 0.5, random.Random(0)) == edges
+
+
+def test_reviews(archive: Path) -> None:
+    """Hotels are sampled while the archive is read."""
+    sample = list(tripadvisor.reviews(sample_hotels=2, seed=5))
+    assert len(sample) == 2
+    assert list(tripadvisor.reviews(sample_hotels=2, seed=5)) == sample
+    assert [obj for obj in HOTELS if obj in sample] == sample
+
+
+def test_load(archive: Path) -> None:
+    """Sampled hotels are loaded with all their reviews."""
+    graph = Graph()
+    tripadvisor.load(graph, sample_hotels=1, seed=2)
+    assert len(graph.products) == 1
+
+    again = Graph()
+    tripadvisor.load(again, sample_hotels=1, seed=2)
+    assert again.reviews == graph.reviews
+
+    graph = Graph()
+    tripadvisor.load(graph, sample_fraction=0.5)
+    assert sum(len(v) for v in graph.reviews.values()) == 3
@@ -0,0 +1,173 @@
+#
+# test_server.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import json
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import requests
+
+pytest.importorskip("click")
+pytest.importorskip("rsd")
+
+from tripadvisor.server import Server, _QueueWriter  # noqa: E402
+
+
+@pytest.fixture
+def server(archive: Path, tmp_path: Path) -> Iterator[str]:
+    """Starts a server in a background thread and returns its URL."""
+    output_dir = tmp_path.joinpath("outputs")
+    output_dir.mkdir()
+    with Server(("127.0.0.1", 0), workers=2, output_dir=output_dir) as s:
+        thread = threading.Thread(target=s.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{s.server_address[1]}"
+        s.shutdown()
+        thread.join()
+
+
+def test_health(server: str) -> None:
+    res = requests.get(f"{server}/health")
+    assert res.json() == {"status": "ok", "reviews": 6}
+
+
+def test_run(server: str) -> None:
+    """Outputs are streamed as JSON lines followed by a status."""
+    req = {
+        "method": "rsd",
+        "params": {"theta": 0.1},
+        "loop": 2,
+        "top": 1,
+        "options": {"since": 20080101},
+    }
+    with requests.post(f"{server}/run", json=req, stream=True) as res:
+        assert res.status_code == 200
+        lines = [json.loads(line) for line in res.iter_lines()]
+
+    assert lines[-1]["status"] == "finished"
+    assert lines[-1]["reason"] in ("loop", "converged")
+    assert lines[0]["iteration"] == 0
+    assert lines[-2]["iteration"] == "final"
+    assert all(len(obj) == 2 and "reviewer" in obj for obj in lines[:-1])
+
+
+def test_concurrent_runs(server: str) -> None:
+    """Runs requested at the same time are executed by workers."""
+    req = {"method": "rsd", "loop": 2}
+
+    def post() -> list[dict[str, object]]:
+        with requests.post(f"{server}/run", json=req, stream=True) as res:
+            return [json.loads(line) for line in res.iter_lines()]
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda _: post(), range(4)))
+    assert all(lines[-1]["status"] == "finished" for lines in results)
+    assert all(lines[:-1] == results[0][:-1] for lines in results)
+
+
+def test_run_to_file(server: str, tmp_path: Path) -> None:
+    """Outputs are written to a requested file."""
+    req = {"method": "rsd", "loop": 1, "output": "output.jsonl"}
+    res = requests.post(f"{server}/run", json=req)
+    assert res.json()["status"] == "finished"
+    assert "final" in tmp_path.joinpath("outputs/output.jsonl").read_text()
+
+
+@pytest.mark.parametrize("output", ["../output.jsonl", "/etc/passwd", "."])
+def test_run_to_outside(server: str, tmp_path: Path, output: str) -> None:
+    """Outputs outside of the output directory are rejected."""
+    req = {"method": "rsd", "loop": 1, "output": output}
+    res = requests.post(f"{server}/run", json=req)
+    assert res.status_code == 400
+    assert not tmp_path.joinpath("output.jsonl").exists()
+
+
+def test_run_to_file_disabled(archive: Path) -> None:
+    """Outputs cannot be written to files without the output directory."""
+    with Server(("127.0.0.1", 0)) as s:
+        with pytest.raises(ValueError):
+            s.output_path("output.jsonl")
+
+
+def test_run_failed(server: str) -> None:
+    """Failures while running are reported in the status."""
+    req = {"method": "rsd", "options": {"unknown": 1}}
+    with requests.post(f"{server}/run", json=req, stream=True) as res:
+        lines = [json.loads(line) for line in res.iter_lines()]
+    assert lines[-1]["status"] == "failed"
+
+
+@pytest.mark.parametrize(
+    "req",
+    [{"method": "unknown"}, {"loop": 1}, {"method": "rsd", "unknown": 1}, []],
+)
+def test_bad_request(server: str, req: object) -> None:
+    res = requests.post(f"{server}/run", json=req)
+    assert res.status_code == 400
+
+
+def test_worker_died(archive: Path) -> None:
+    """Runs whose worker has died fail, and the workers are restarted."""
+    req = {"method": "rsd", "loop": 1}
+    with Server(("127.0.0.1", 0)) as s:
+        thread = threading.Thread(target=s.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{s.server_address[1]}/run"
+        assert requests.post(url, json=req).status_code == 200
+
+        for p in list(s.pool._processes.values()):  # type: ignore[union-attr]
+            p.kill()
+            p.join()
+        res = requests.post(url, json=req)
+        assert res.status_code == 503
+        assert res.json()["status"] == "failed"
+
+        with requests.post(url, json=req, stream=True) as res:
+            lines = [json.loads(line) for line in res.iter_lines()]
+        assert lines[-1]["status"] == "finished"
+        s.shutdown()
+        thread.join()
+
+
+def test_queue_writer() -> None:
+    """Output lines are sent in chunks."""
+    q: queue.Queue[str | None] = queue.Queue()
+    cancelled = threading.Event()
+    writer = _QueueWriter(q, cancelled)
+    for i in range(1500):
+        writer.write(str(i))
+        writer.write("\n")
+    assert q.qsize() == 1
+    writer.flush()
+    writer.flush()
+    chunks = [q.get() for _ in range(q.qsize())]
+    assert [len(c.splitlines()) for c in chunks if c] == [1000, 500]
+    assert "".join(c for c in chunks if c).split() == [
+        str(i) for i in range(1500)
+    ]
+
+    cancelled.set()
+    writer.write("x\n")
+    with pytest.raises(ConnectionAbortedError):
+        writer.flush()
@@ -0,0 +1,96 @@
+#
+# test_shared.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import tripadvisor
+from tests.conftest import HOTELS, Graph
+from tripadvisor import cache, shared
+
+
+def load_shared(name: str) -> dict[str, dict[str, float]]:
+    """Loads a graph from a shared dataset in a worker process."""
+    graph = Graph()
+    with shared.attach(name) as s:
+        tripadvisor.load(graph, source=s.dataset)
+    return dict(graph.reviews)
+
+
+def test_attach(tmp_path: Path) -> None:
+    """An attached dataset has the same contents as the edge cache."""
+    path = cache.build(HOTELS, tmp_path.joinpath("edges"))
+    expect = cache.open_dataset(path)
+
+    with cache_shared(path) as owner:
+        with shared.attach(owner.name) as s:
+            data = s.dataset
+            assert data.path == path
+            assert isinstance(data.reviewers, cache.IdTable)
+            assert list(data.reviewers) == list(expect.reviewers)
+            assert list(data.products) == list(expect.products)
+            for name in ["reviewer", "product", "score", "date"]:
+                assert list(getattr(data, name)) == list(getattr(expect, name))
+            assert list(data.window(20080101, 20081231)) == list(
+                expect.window(20080101, 20081231)
+            )
+            assert data.fingerprint == expect.fingerprint
+            del data
+
+    with pytest.raises(FileNotFoundError):
+        shared.attach(owner.name)
+
+
+def test_fingerprint(tmp_path: Path) -> None:
+    """An attached dataset keeps the fingerprint of the shared cache."""
+    path = cache.build(HOTELS, tmp_path.joinpath("edges"))
+    expect = cache.open_dataset(path).fingerprint
+
+    with cache_shared(path) as owner:
+        cache.build(HOTELS[:1], path)
+        assert cache.open_dataset(path).fingerprint != expect
+        with shared.attach(owner.name) as s:
+            assert s.dataset.fingerprint == expect
+            assert owner.dataset.fingerprint == expect
+
+
+def test_share(archive: Path) -> None:
+    """Worker processes load graphs from the shared dataset."""
+    expect = Graph()
+    tripadvisor.load(expect)
+
+    with tripadvisor.share() as s:
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(load_shared, [s.name] * 2))
+    assert results == [dict(expect.reviews)] * 2
+
+
+def test_share_empty(tmp_path: Path) -> None:
+    """An empty dataset can be shared."""
+    path = cache.build([], tmp_path.joinpath("edges"))
+    with cache_shared(path) as s:
+        assert len(s.dataset) == 0
+        assert len(s.dataset.reviewers) == 0
+
+
+def cache_shared(path: Path) -> shared.SharedDataset:
+    return shared.SharedDataset.create(path)
@@ -0,0 +1,100 @@
+#
+# test_snapshot.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tests.conftest import Graph
+from tripadvisor.snapshot import Snapshots, snapshot_key
+
+
+def test_snapshot_key() -> None:
+    """Keys depend on every component."""
+    key = snapshot_key("rsd", {"theta": 0.1}, {"k_core": 2}, "abc")
+    assert key == snapshot_key("rsd", {"theta": 0.1}, {"k_core": 2}, "abc")
+    assert key != snapshot_key("rsd", {"theta": 0.2}, {"k_core": 2}, "abc")
+    assert key != snapshot_key("rsd", {"theta": 0.1}, {}, "abc")
+    assert key != snapshot_key("rsd", {"theta": 0.1}, {"k_core": 2}, "def")
+    assert key != snapshot_key("feagle", {"theta": 0.1}, {"k_core": 2}, "abc")
+
+
+def test_snapshots(tmp_path: Path, graph: Graph) -> None:
+    """A stored graph is restored."""
+    reviewer = graph.new_reviewer("reviewer")
+    product = graph.new_product("product")
+    graph.add_review(reviewer, product, 0.5)
+
+    snapshots = Snapshots(tmp_path, 1024 * 1024)
+    assert snapshots.get("key") is None
+
+    snapshots.put("key", graph)
+    restored = snapshots.get("key")
+    assert isinstance(restored, Graph)
+    assert restored.reviewers == graph.reviewers
+    assert restored.reviews == graph.reviews
+
+
+def test_concurrent_put(tmp_path: Path, graph: Graph) -> None:
+    """Threads can store snapshots of the same key at the same time."""
+    for i in range(100):
+        graph.new_reviewer(f"reviewer-{i}")
+    snapshots = Snapshots(tmp_path, 1024 * 1024)
+    with ThreadPoolExecutor(4) as executor:
+        for future in [
+            executor.submit(snapshots.put, "key", graph) for _ in range(16)
+        ]:
+            future.result()
+
+    restored = snapshots.get("key")
+    assert isinstance(restored, Graph)
+    assert restored.reviewers == graph.reviewers
+    assert [p.name for p in tmp_path.iterdir()] == ["key.pickle"]
+
+
+def test_eviction(tmp_path: Path, graph: Graph) -> None:
+    """Least recently used snapshots are evicted."""
+    size = len(pickle.dumps(graph, pickle.HIGHEST_PROTOCOL))
+    snapshots = Snapshots(tmp_path, 2 * size)
+    snapshots.put("a", graph)
+    snapshots.put("b", graph)
+    os.utime(tmp_path.joinpath("a.pickle"), ns=(0, 0))
+    os.utime(tmp_path.joinpath("b.pickle"), ns=(1, 1))
+
+    # Using a makes b the least recently used one.
+    assert snapshots.get("a") is not None
+    snapshots.put("c", graph)
+    assert snapshots.get("b") is None
+    assert snapshots.get("a") is not None
+    assert snapshots.get("c") is not None
+
+
+def test_broken_snapshot(tmp_path: Path) -> None:
+    """Broken snapshots are discarded."""
+    tmp_path.joinpath("key.pickle").write_bytes(b"broken")
+    assert Snapshots(tmp_path, 1024).get("key") is None
+    assert not tmp_path.joinpath("key.pickle").exists()
+
+
+def test_too_large(tmp_path: Path, graph: Graph) -> None:
+    """Snapshots larger than the limit are not kept."""
+    Snapshots(tmp_path, 0).put("a", graph)
+    assert not tmp_path.joinpath("a.pickle").exists()
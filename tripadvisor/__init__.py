@@ -22,6 +22,29 @@
 
 from typing import Final
 
-from tripadvisor.loader import load, reviews
+from tripadvisor.cache import Dataset, Stats
+from tripadvisor.loader import (
+    aload,
+    areviews,
+    dataset,
+    export,
+    load,
+    merge,
+    reviews,
+    share,
+    stats,
+)
 
-__all__: Final = ["load", "reviews"]
+__all__: Final = [
+    "Dataset",
+    "Stats",
+    "aload",
+    "areviews",
+    "dataset",
+    "export",
+    "load",
+    "merge",
+    "reviews",
+    "share",
+    "stats",
+]
@@ -0,0 +1,742 @@
+#
+# cache.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a compact edge cache of the Trip Advisor dataset.
+
+The raw archive stores one JSON document per hotel, and parsing it takes
+minutes. This module converts those documents once into a set of flat
+columns, one entry per review, and two ID tables mapping column values to
+reviewer and hotel IDs. The columns are memory-mapped when opened, so
+loading the cache costs almost nothing.
+
+A cache directory consists of the following files:
+
+* ``reviewers.txt`` and ``products.txt``: ID tables, one ID per line,
+* ``reviewers.idx`` and ``products.idx``: byte offsets of the lines in the
+  ID tables, which allow reading an ID without reading the whole table,
+* ``reviewer.bin``, ``product.bin``, ``score.bin`` and ``date.bin``:
+  the edge columns stored as native arrays,
+* ``date_order.bin`` and ``sorted_date.bin``: a date index, i.e. edge
+  indices sorted by date and the dates in that order,
+* ``stats.json``: precomputed statistics of the dataset,
+* ``meta.json``: the format version, the fingerprint of the source, and
+  the fingerprint of the cached data.
+  This file is written last and marks the cache as complete.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import uuid
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final, Literal, cast, overload
+
+from tripadvisor.memory import MemoryBudgetExceeded, MemoryGuard
+
+LOGGER = logging.getLogger(__name__)
+
+VERSION: Final = 4
+"""Version of the cache format."""
+
+_DATE_FORMAT: Final = "%B %d, %Y"
+"""Data format in the dataset.
+"""
+
+_COLUMNS: Final = {"reviewer": "I", "product": "I", "score": "d", "date": "I"}
+"""Names and array type codes of the edge columns."""
+
+
+@dataclass(frozen=True)
+class Stats:
+    """Statistics of the Trip Advisor dataset."""
+
+    reviews: int
+    """The number of reviews."""
+    reviewers: int
+    """The number of reviewers."""
+    products: int
+    """The number of hotels."""
+    reviewer_degrees: dict[int, int]
+    """Degree distribution of reviewers, i.e. degree -> number of reviewers."""
+    product_degrees: dict[int, int]
+    """Degree distribution of hotels, i.e. degree -> number of hotels."""
+    ratings: dict[float, int]
+    """Histogram of overall ratings, i.e. rating -> number of reviews."""
+    first_date: int | None
+    """The date of the oldest review in yyyymmdd format."""
+    last_date: int | None
+    """The date of the newest review in yyyymmdd format."""
+    undated: int
+    """The number of reviews of which dates cannot be parsed."""
+
+    def to_json(self) -> dict[str, Any]:
+        """Returns a JSON compatible dict representing this object."""
+        return {
+            "reviews": self.reviews,
+            "reviewers": self.reviewers,
+            "products": self.products,
+            "reviewer_degrees": _sorted_items(self.reviewer_degrees),
+            "product_degrees": _sorted_items(self.product_degrees),
+            "ratings": _sorted_items(self.ratings),
+            "first_date": self.first_date,
+            "last_date": self.last_date,
+            "undated": self.undated,
+        }
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> "Stats":
+        """Creates an object from a dict created by :meth:`to_json`."""
+        return cls(
+            reviews=obj["reviews"],
+            reviewers=obj["reviewers"],
+            products=obj["products"],
+            reviewer_degrees={
+                int(k): v for k, v in obj["reviewer_degrees"].items()
+            },
+            product_degrees={
+                int(k): v for k, v in obj["product_degrees"].items()
+            },
+            ratings={float(k): v for k, v in obj["ratings"].items()},
+            first_date=obj["first_date"],
+            last_date=obj["last_date"],
+            undated=obj["undated"],
+        )
+
+
+def _sorted_items(d: dict[Any, int]) -> dict[str, int]:
+    """Returns a given histogram as a JSON object sorted by keys."""
+    return {str(k): d[k] for k in sorted(d)}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Edge columns and ID tables of the Trip Advisor dataset.
+
+    The i-th review is posted by reviewer ``reviewers[reviewer[i]]`` to
+    hotel ``products[product[i]]`` with normalized score ``score[i]`` on
+    ``date[i]``. Dates are integers in yyyymmdd format, and 0 means the date
+    is unknown. Reviews of a hotel are stored contiguously.
+    """
+
+    path: Path
+    """Directory this dataset is stored in."""
+    reviewers: Sequence[str]
+    """Reviewer ID table."""
+    products: Sequence[str]
+    """Hotel ID table."""
+    reviewer: Sequence[int]
+    """Reviewer index of each review."""
+    product: Sequence[int]
+    """Hotel index of each review."""
+    score: Sequence[float]
+    """Normalized score in [0, 1] of each review."""
+    date: Sequence[int]
+    """Date of each review in yyyymmdd format, 0 if unknown."""
+    date_order: Sequence[int]
+    """Edge indices sorted by date."""
+    sorted_date: Sequence[int]
+    """Dates of edges in the order of :attr:`date_order`."""
+    digest: str | None = None
+    """Fingerprint of this dataset if it's known without reading the cache."""
+
+    def __len__(self) -> int:
+        return len(self.reviewer)
+
+    def window(
+        self, since: int | None = None, until: int | None = None
+    ) -> Sequence[int]:
+        """Selects edges posted in a given period.
+
+        The date index is searched by bisection, and only the slice of the
+        index covering the period is read. Reviews of which dates are unknown
+        are never selected.
+
+        Args:
+          since: the first date of the period in yyyymmdd format
+            (default: unbounded).
+          until: the last date of the period in yyyymmdd format
+            (default: unbounded).
+
+        Returns:
+          Indices of edges in the period sorted by date.
+        """
+        start = bisect_left(self.sorted_date, max(since or 1, 1))
+        end = (
+            len(self.sorted_date)
+            if until is None
+            else bisect_right(self.sorted_date, until)
+        )
+        return self.date_order[start:end]
+
+    @property
+    def stats(self) -> Stats:
+        """Precomputed statistics of this dataset."""
+        return read_stats(self.path)
+
+    @property
+    def fingerprint(self) -> str:
+        """A digest of the ID tables and edge columns of this dataset."""
+        if self.digest is not None:
+            return self.digest
+        meta = read_meta(self.path)
+        if meta is None:
+            raise ValueError(f"{self.path} is not a complete edge cache")
+        return cast(str, meta["fingerprint"])
+
+
+def parse_date(value: str) -> int | None:
+    """Parses a date string in the dataset.
+
+    Args:
+      value: a date string such as ``January 1, 2008``.
+
+    Returns:
+      The date in yyyymmdd format, or None if it cannot be parsed.
+    """
+    try:
+        return int(datetime.strptime(value, _DATE_FORMAT).strftime("%Y%m%d"))
+    except ValueError:
+        return None
+
+
+def build(
+    hotels: Iterable[dict[str, Any]],
+    path: Path,
+    source: Any = None,
+    guard: MemoryGuard | None = None,
+) -> Path:
+    """Builds an edge cache from hotel objects.
+
+    The cache is first written into a temporary directory next to *path* and
+    then moved to *path*, so that readers never see a half-written cache.
+
+    Args:
+      hotels: an iterable of hotel objects in the raw dataset format.
+      path: directory where the cache will be stored.
+      source: a JSON compatible fingerprint of the source archive.
+      guard: if given, memory usage is checked against its budget after
+        each hotel is parsed.
+
+    Returns:
+      The path of the cache directory.
+
+    Raises:
+      tripadvisor.memory.MemoryBudgetExceeded: if the usage exceeds the
+        budget of *guard*; nothing is written in that case.
+    """
+    reviewer_ids: dict[str, int] = {}
+    product_ids: dict[str, int] = {}
+    columns: dict[str, array[Any]] = {k: array(t) for k, t in _COLUMNS.items()}
+    ratings = Counter[float]()
+
+    for obj in hotels:
+        product = product_ids.setdefault(
+            str(obj["HotelInfo"]["HotelID"]), len(product_ids)
+        )
+        for r in obj["Reviews"]:
+            rating = float(r["Ratings"]["Overall"])
+            ratings[rating] += 1
+
+            columns["reviewer"].append(
+                reviewer_ids.setdefault(str(r["ReviewID"]), len(reviewer_ids))
+            )
+            columns["product"].append(product)
+            columns["score"].append(rating / 5.0)
+            columns["date"].append(parse_date(r["Date"]) or 0)
+        if guard is not None and not guard.fits(0):
+            raise MemoryBudgetExceeded(
+                guard.build_report(len(columns["reviewer"]))
+            )
+
+    return write(
+        path, list(reviewer_ids), list(product_ids), columns, ratings, source
+    )
+
+
+def write(
+    path: Path,
+    reviewers: Sequence[str],
+    products: Sequence[str],
+    columns: dict[str, "array[Any]"],
+    ratings: dict[float, int],
+    source: Any = None,
+) -> Path:
+    """Writes ID tables and edge columns as an edge cache.
+
+    Args:
+      path: directory where the cache will be stored.
+      reviewers: reviewer ID table.
+      products: hotel ID table.
+      columns: edge columns keyed by their names.
+      ratings: histogram of overall ratings.
+      source: a JSON compatible fingerprint of the source.
+
+    Returns:
+      The path of the cache directory.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Each writer uses its own directory since processes loading the dataset
+    # at the same time build the cache concurrently.
+    tmp = Path(
+        tempfile.mkdtemp(
+            prefix=path.name + ".", suffix=".tmp", dir=path.parent
+        )
+    )
+    try:
+        _write_ids(tmp.joinpath("reviewers.txt"), reviewers)
+        _write_ids(tmp.joinpath("products.txt"), products)
+        date = columns["date"]
+        order = array("I", sorted(range(len(date)), key=date.__getitem__))
+        index = {
+            **columns,
+            "date_order": order,
+            "sorted_date": array("I", (date[i] for i in order)),
+        }
+        for name, col in index.items():
+            with open(tmp.joinpath(f"{name}.bin"), "wb") as f:
+                col.tofile(f)
+
+        dates = [d for d in columns["date"] if d]
+        stats = Stats(
+            reviews=len(columns["reviewer"]),
+            reviewers=len(reviewers),
+            products=len(products),
+            reviewer_degrees=dict(
+                Counter(Counter(columns["reviewer"]).values())
+            ),
+            product_degrees=dict(
+                Counter(Counter(columns["product"]).values())
+            ),
+            ratings=dict(ratings),
+            first_date=min(dates, default=None),
+            last_date=max(dates, default=None),
+            undated=len(columns["date"]) - len(dates),
+        )
+        with open(tmp.joinpath("stats.json"), "w") as f:
+            json.dump(stats.to_json(), f)
+        digest = hashlib.sha256()
+        for name in [
+            "reviewers.txt",
+            "products.txt",
+            *(f"{k}.bin" for k in columns),
+        ]:
+            with open(tmp.joinpath(name), "rb") as fp:
+                digest.update(hashlib.file_digest(fp, "sha256").digest())
+        with open(tmp.joinpath("meta.json"), "w") as f:
+            json.dump(
+                {
+                    "version": VERSION,
+                    "source": source,
+                    "fingerprint": digest.hexdigest(),
+                },
+                f,
+            )
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    _replace(tmp, path, source, digest.hexdigest())
+    LOGGER.info("Stored %d reviews at %s", stats.reviews, path)
+    return path
+
+
+def _replace(tmp: Path, path: Path, source: Any, fingerprint: str) -> None:
+    """Moves a written cache to its path unless the same cache is there.
+
+    Another process may store a cache at the path at the same time. A cache
+    with the same fingerprint and source is kept and the written one is
+    discarded; other caches are replaced.
+    """
+    while True:
+        try:
+            tmp.rename(path)
+            return
+        except OSError:
+            # The path is an existing cache, which is not empty.
+            pass
+        meta = read_meta(path)
+        if (
+            meta is not None
+            and meta["fingerprint"] == fingerprint
+            and meta["source"] == source
+        ):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        # Processes having mapped files of the old cache can still use them.
+        old = path.with_name(f"{path.name}.{uuid.uuid4().hex}.old")
+        try:
+            path.rename(old)
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _write_ids(path: Path, ids: Sequence[str]) -> None:
+    """Writes an ID table and its offset index."""
+    offsets = array("Q", [0])
+    with open(path, "wb") as f:
+        for v in ids:
+            offsets.append(offsets[-1] + f.write(v.encode() + b"\n"))
+    with open(path.with_suffix(".idx"), "wb") as f:
+        offsets.tofile(f)
+
+
+def read_meta(path: Path) -> dict[str, Any] | None:
+    """Reads metadata of an edge cache.
+
+    Args:
+      path: directory of the cache.
+
+    Returns:
+      The metadata, or None if the cache doesn't exist, is incomplete, or
+      was written in another format version.
+    """
+    try:
+        with open(path.joinpath("meta.json")) as f:
+            meta = cast(dict[str, Any], json.load(f))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == VERSION else None
+
+
+def read_stats(path: Path) -> Stats:
+    """Reads precomputed statistics of an edge cache.
+
+    Args:
+      path: directory of the cache.
+
+    Returns:
+      The statistics of the cached dataset.
+    """
+    with open(path.joinpath("stats.json")) as f:
+        return Stats.from_json(json.load(f))
+
+
+class IdTable(Sequence[str]):
+    """An ID table decoding IDs from a buffer on access.
+
+    The table keeps only the contents of an ID table file and its offset
+    index, which are usually memory-mapped, and creates a string every time
+    an ID is read. It trades the speed of lookups for memory compared with a
+    list of IDs.
+
+    Args:
+      data: contents of the ID table file.
+      offsets: contents of the offset index.
+    """
+
+    def __init__(self, data: Sequence[int], offsets: Sequence[int]) -> None:
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def open(cls, path: Path) -> "IdTable":
+        """Memory-maps an ID table file and its offset index."""
+        return cls(_column(path, "B"), _column(path.with_suffix(".idx"), "Q"))
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, i: int | slice) -> str | Sequence[str]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ID table index out of range")
+        start = self._offsets[i]
+        end = self._offsets[i + 1] - 1
+        return bytes(self._data[start:end]).decode()
+
+
+def open_dataset(path: Path, lazy_ids: bool = False) -> Dataset:
+    """Opens an edge cache.
+
+    Edge columns are memory-mapped and ID tables are read into memory.
+
+    Args:
+      path: directory of the cache.
+      lazy_ids: if True, ID tables are memory-mapped as :class:`IdTable`
+        instead of being read into memory.
+
+    Returns:
+      The cached dataset.
+    """
+    read_ids: Callable[[Path], Sequence[str]] = (
+        IdTable.open if lazy_ids else _read_ids
+    )
+    return Dataset(
+        path=path,
+        reviewers=read_ids(path.joinpath("reviewers.txt")),
+        products=read_ids(path.joinpath("products.txt")),
+        reviewer=_column(path.joinpath("reviewer.bin"), "I"),
+        product=_column(path.joinpath("product.bin"), "I"),
+        score=_column(path.joinpath("score.bin"), "d"),
+        date=_column(path.joinpath("date.bin"), "I"),
+        date_order=_column(path.joinpath("date_order.bin"), "I"),
+        sorted_date=_column(path.joinpath("sorted_date.bin"), "I"),
+    )
+
+
+def _read_ids(path: Path) -> list[str]:
+    """Reads an ID table."""
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def _column(
+    path: Path, typecode: Literal["B", "I", "Q", "d"]
+) -> Sequence[Any]:
+    """Memory-maps an edge column stored in a given file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return array(typecode)
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(m).cast(typecode)
+
+
+def prune(
+    data: Dataset,
+    edges: Sequence[int] | None = None,
+    *,
+    min_reviewer_degree: int = 0,
+    min_product_degree: int = 0,
+    k_core: int = 0,
+) -> Sequence[int]:
+    """Selects edges of which endpoints have enough degrees.
+
+    Minimum degree filters are applied once with degrees counted on the given
+    edges; a reviewer or hotel that loses edges by these filters is kept even
+    if its degree drops below the minimum. The k-core filter then removes
+    reviewers and hotels repeatedly until every remaining one has at least
+    *k_core* edges.
+
+    Reviewers are identified by review IDs, which are unique per review in
+    the Trip Advisor archive, so every reviewer of a cache built from it has
+    one review; *min_reviewer_degree* and *k_core* above 1 then select no
+    edges, and a warning is logged when filters remove every edge.
+
+    Args:
+      data: the dataset.
+      edges: indices of edges to be filtered (default: all edges).
+      min_reviewer_degree: minimum number of reviews a reviewer must post.
+      min_product_degree: minimum number of reviews a hotel must receive.
+      k_core: order of the core to be extracted, 0 disables the filter.
+
+    Returns:
+      Indices of the surviving edges in the given order.
+    """
+    selected: Sequence[int] = range(len(data)) if edges is None else edges
+    given = len(selected)
+    if min_reviewer_degree > 1 or min_product_degree > 1:
+        r_deg = _degrees(data.reviewer, selected, len(data.reviewers))
+        p_deg = _degrees(data.product, selected, len(data.products))
+        selected = array(
+            "I",
+            (
+                i
+                for i in selected
+                if r_deg[data.reviewer[i]] >= min_reviewer_degree
+                and p_deg[data.product[i]] >= min_product_degree
+            ),
+        )
+    if k_core > 1:
+        selected = _core(data, selected, k_core)
+    if given and not selected:
+        LOGGER.warning(
+            "Pruning removed every review; reviewers are identified by "
+            "review IDs, so most have only one review"
+        )
+    return selected
+
+
+def _degrees(
+    column: Sequence[int], edges: Sequence[int], size: int
+) -> "array[int]":
+    """Counts how many of given edges each node has."""
+    deg = array("I", bytes(4 * size))
+    for i in edges:
+        deg[column[i]] += 1
+    return deg
+
+
+def _core(data: Dataset, edges: Sequence[int], k: int) -> "array[int]":
+    """Extracts edges in the k-core of the subgraph induced by given edges.
+
+    Nodes with less than k alive edges are peeled one by one, and the degrees
+    of their neighbours are updated incrementally, so that each edge is
+    visited a constant number of times.
+    """
+    edges = array("I", edges)
+    alive = bytearray(b"\x01") * len(edges)
+    sides = []
+    for column, size in (
+        (data.reviewer, len(data.reviewers)),
+        (data.product, len(data.products)),
+    ):
+        # Adjacency lists in the CSR format; positions refer to `edges`.
+        nodes = array("I", (column[i] for i in edges))
+        deg = _degrees(nodes, range(len(nodes)), size)
+        offsets = array("I", bytes(4 * (size + 1)))
+        for v in range(size):
+            offsets[v + 1] = offsets[v] + deg[v]
+        adj = array("I", bytes(4 * len(edges)))
+        head = array("I", offsets)
+        for pos, v in enumerate(nodes):
+            adj[head[v]] = pos
+            head[v] += 1
+        sides.append((nodes, deg, offsets, adj))
+
+    queue = [
+        (s, v)
+        for s, (_, deg, _, _) in enumerate(sides)
+        for v in range(len(deg))
+        if 0 < deg[v] < k
+    ]
+    while queue:
+        s, v = queue.pop()
+        _, _, offsets, adj = sides[s]
+        for pos in adj[offsets[v] : offsets[v + 1]]:
+            if not alive[pos]:
+                continue
+            alive[pos] = 0
+            other, deg, _, _ = sides[1 - s]
+            u = other[pos]
+            deg[u] -= 1
+            if deg[u] == k - 1:
+                queue.append((1 - s, u))
+
+    return array("I", (i for i, a in zip(edges, alive) if a))
+
+
+def shard_of(product: str, n: int) -> int:
+    """Returns the shard a hotel belongs to.
+
+    Hotels are partitioned by the CRC32 checksum of their IDs, which is
+    stable across processes and machines.
+
+    Args:
+      product: ID of the hotel.
+      n: the number of shards.
+
+    Returns:
+      The index of the shard in [0, n).
+    """
+    return zlib.crc32(product.encode()) % n
+
+
+def partition(
+    data: Dataset, shard: tuple[int, int], edges: Sequence[int] | None = None
+) -> Sequence[int]:
+    """Selects edges of hotels belonging to a given shard.
+
+    Args:
+      data: the dataset.
+      shard: a pair of the index of the shard and the number of shards.
+      edges: indices of edges to be filtered (default: all edges).
+
+    Returns:
+      Indices of the selected edges in the given order.
+    """
+    i, n = shard
+    member = bytes(shard_of(p, n) == i for p in data.products)
+    return array(
+        "I",
+        (
+            e
+            for e in (range(len(data)) if edges is None else edges)
+            if member[data.product[e]]
+        ),
+    )
+
+
+def merge(paths: Iterable[Path], path: Path) -> Path:
+    """Merges edge caches of shards into one edge cache.
+
+    Reviewers and hotels appearing in several shards are unified by their
+    IDs, and statistics are recomputed for the merged dataset.
+
+    Args:
+      paths: directories of the edge caches to be merged.
+      path: directory where the merged cache will be stored.
+
+    Returns:
+      The path of the merged cache directory.
+    """
+    reviewer_ids: dict[str, int] = {}
+    product_ids: dict[str, int] = {}
+    columns: dict[str, array[Any]] = {k: array(t) for k, t in _COLUMNS.items()}
+    ratings = Counter[float]()
+    sources = []
+
+    for shard in paths:
+        meta = read_meta(shard)
+        if meta is None:
+            raise ValueError(f"{shard} is not a complete edge cache")
+        sources.append(meta["source"])
+        data = open_dataset(shard)
+        LOGGER.info("Merging %d reviews from %s", len(data), shard)
+
+        reviewers = array(
+            "I",
+            (
+                reviewer_ids.setdefault(v, len(reviewer_ids))
+                for v in data.reviewers
+            ),
+        )
+        products = array(
+            "I",
+            (
+                product_ids.setdefault(v, len(product_ids))
+                for v in data.products
+            ),
+        )
+        columns["reviewer"].extend(reviewers[r] for r in data.reviewer)
+        columns["product"].extend(products[p] for p in data.product)
+        columns["score"].extend(data.score)
+        columns["date"].extend(data.date)
+        ratings.update(data.stats.ratings)
+
+    # The merged cache inherits the source only if all shards agree on it.
+    source = (
+        sources[0]
+        if sources and sources.count(sources[0]) == len(sources)
+        else None
+    )
+    return write(
+        path, list(reviewer_ids), list(product_ids), columns, ratings, source
+    )
@@ -20,33 +20,103 @@
 #
 """Evaluate a review graph mining algorithm with the Trip Advisor dataset.
 
-Usage: python -m tripadvisor [OPTIONS]
+Usage: python -m tripadvisor [OPTIONS] [COMMAND] [ARGS]...
 
   Evaluate a review graph mining algorithm with the Trip Advisor dataset.
 
 Options:
   -m, --method [rsd|feagle|fraudar]
-                                  name of algorithm.  [required]
+                                  name of algorithm.
   --loop INTEGER                  number of iteration.
-  --threshold FLOAT               threshold.
+  --threshold FLOAT               absolute tolerance of updates.
+  --rtol FLOAT                    tolerance of updates relative to the first
+                                  update.
+  --patience INTEGER RANGE        number of iterations with flat updates to
+                                  stop, 0 disables it.  [x>=0]
+  --time-budget FLOAT RANGE       seconds the whole run may take.  [x>=0]
+  --snapshot / --no-snapshot      restore the loaded graph from a snapshot if
+                                  exists, and store it otherwise. [Default:
+                                  no-snapshot]
+  --snapshot-size INTEGER RANGE   maximum total size of snapshots in MiB.
+                                  [x>=0]
   --output FILENAME               file path to store results. [Default:
                                   stdout]
   --param TEXT                    key and value a pair of parameters
                                   corresponding to the chosen algorithm,
                                   connected with '='.
+  --db FILE                       SQLite database to store results in instead
+                                  of --output.
+  --top INTEGER RANGE             print only this number of the most anomalous
+                                  reviewers.  [x>=1]
+  --products / --no-products      print products with --top. [Default: no-
+                                  products]
+  --warm-start FILENAME           output of a previous run to take initial
+                                  anomalous scores of reviewers from.
+  --since INTEGER                 load reviews posted on or after this date
+                                  (yyyymmdd).
+  --until INTEGER                 load reviews posted on or before this date
+                                  (yyyymmdd).
+  --shard SHARD                   load only hotels in the i-th of n shards,
+                                  given as i/n.
+  --sample-hotels INTEGER RANGE   load only this number of randomly sampled
+                                  hotels.  [x>=1]
+  --sample-fraction FLOAT RANGE   load only this fraction of randomly sampled
+                                  reviews.  [0<x<=1]
+  --seed INTEGER                  seed of random sampling.
+  --min-reviewer-degree INTEGER RANGE
+                                  drop reviewers posting fewer reviews than
+                                  this; reviewers are review IDs having one
+                                  review each, so values above 1 are rejected.
+                                  [x>=0]
+  --min-product-degree INTEGER RANGE
+                                  drop products receiving fewer reviews than
+                                  this.  [x>=0]
+  --k-core INTEGER RANGE          load only the k-core of the review graph;
+                                  reviewers are review IDs having one review
+                                  each, so values above 1 are rejected.
+                                  [x>=0]
+  --memory-budget SIZE            memory loading may use, e.g. 512M or 8G;
+                                  loading switches to a low-memory mode or
+                                  fails if it is projected to exceed this.
   --version                       Show the version and exit.
   --help                          Show this message and exit.
+
+Commands:
+  export   Export the dataset, or a shard of it, as an edge cache to DEST.
+  index    Store JSON lines written by a run in a SQLite database DB.
+  merge    Merge edge caches exported from shards into one dataset.
+  query    Query results stored in a SQLite database DB.
+  serve    Serve run requests with the dataset kept in memory.
+  stats    Print statistics of the Trip Advisor dataset.
+  windows  Run an algorithm over sliding windows of review dates.
 """
 
+import json
 import logging
 import sys
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import date, timedelta
 from importlib.metadata import version
+from pathlib import Path
 from typing import TextIO, Callable, Any, Protocol, Final
 
 import click
 
-from tripadvisor.debug import print_state, Graph as PrintableGraph
-from tripadvisor.loader import load, Graph as LoadableGraph
+from tripadvisor.convergence import Convergence, StopReason
+from tripadvisor.debug import print_state, print_top, Graph as PrintableGraph
+from tripadvisor.loader import (
+    cache_dir,
+    dataset,
+    export as export_dataset,
+    merge as merge_dataset,
+    load,
+    stats as dataset_stats,
+    Graph as LoadableGraph,
+)
+from tripadvisor.memory import MemoryBudgetExceeded
+from tripadvisor.results import ResultStore, read_scores
+from tripadvisor.snapshot import Snapshots, snapshot_key
 
 LOGGER = logging.getLogger(__name__)
 
@@ -126,13 +196,28 @@ except ImportError:
 
 
 def run(
-    method: str, loop: int, threshold: float, output: TextIO, param: tuple[str]
-) -> None:
+    method: str,
+    loop: int,
+    threshold: float,
+    output: TextIO,
+    param: tuple[str, ...],
+    label: dict[str, Any] | None = None,
+    top: int | None = None,
+    products: bool = False,
+    rtol: float = 0.0,
+    patience: int = 0,
+    time_budget: float | None = None,
+    snapshots: Snapshots | None = None,
+    store: ResultStore | None = None,
+    **load_options: Any,
+) -> StopReason | None:
     """Run a given algorithm with the Trip Advisor dataset.
 
     Runs a given algorithm and outputs anomalous scores and summaries after
     each iteration finishes. The function will end if a given number of loops
-    ends or the update of one iteration becomes smaller than a given threshold.
+    ends, the update of one iteration becomes negligible, updates stall or
+    oscillate, or the next iteration would exceed a given time budget.
+    See :class:`tripadvisor.convergence.Convergence` for the details.
 
     Some algorithm requires a set of parameters. For example, feagle requires
     parameter `epsilon`. Argument `param` specifies those parameters, and
@@ -142,35 +227,440 @@ def run(
     Args:
       method: name of algorithm.
       loop: the number of iteration (default: 20).
-      threshold: threshold to judge an update is negligible (default: 10^-3).
+      threshold: absolute tolerance to judge an update is negligible
+        (default: 10^-3).
       output: writable object where the output will be written.
       param: list of key and value pair which are connected with "=".
+      label: additional fields added to every output object.
+      top: if given, only this number of the most anomalous reviewers are
+        printed in each iteration.
+      products: if True, products are printed with the top reviewers.
+      rtol: tolerance to judge an update is negligible, relative to the
+        update of the first iteration (default: 0).
+      patience: the number of iterations with flat updates to judge they
+        stall or oscillate, 0 disables the detection (default: 0).
+      time_budget: seconds the whole run including loading may take
+        (default: unlimited).
+      snapshots: if given, the loaded graph is restored from and stored to
+        this snapshot cache.
+      store: if given, outputs are stored in this result store instead of
+        being written to *output*.
+      load_options: keyword arguments passed to :func:`tripadvisor.load`.
+
+    Returns:
+      The reason why iterations stopped.
     """
+    monitor = Convergence(
+        loop if not method.startswith("one") else 1,
+        atol=threshold,
+        rtol=rtol,
+        patience=patience,
+        time_budget=time_budget,
+    )
     kwargs = {
         key: float(value) for key, value in [v.split("=") for v in param]
     }
 
-    graph = ALGORITHMS[method](**kwargs)
-    load(graph)
-
-    print_state(graph, 0, output)
+    # The memory budget doesn't change the loaded graph, and the source is
+    # identified by its fingerprint.
+    source = load_options.get("source")
+    key = (
+        snapshot_key(
+            method,
+            kwargs,
+            {
+                k: v
+                for k, v in load_options.items()
+                if k not in ("memory_budget", "source")
+            },
+            (dataset() if source is None else source).fingerprint,
+        )
+        if snapshots is not None
+        else None
+    )
+    graph = snapshots.get(key) if snapshots and key else None
+    if graph is None:
+        graph = ALGORITHMS[method](**kwargs)
+        load(graph, **load_options)
+        if snapshots and key:
+            snapshots.put(key, graph)
+    fields = label or {}
+
+    def print_graph(i: int | str) -> None:
+        """Print the current state of the graph."""
+        if store is not None:
+            store.write_state(graph, i, top, top is None or products, **fields)
+        elif top is None:
+            print_state(graph, i, output, **fields)
+        else:
+            print_top(graph, i, top, output, products, **fields)
+
+    print_graph(0)
 
     # Updates
     LOGGER.info("Start iterations.")
-    for i in range(loop if not method.startswith("one") else 1):
+    while monitor.proceed():
         diff = graph.update()
-        if diff is not None and diff < threshold:
+        if monitor.update(diff):
             break
 
         # Current summary
-        LOGGER.info("Iteration %d ends. (diff=%s)", i + 1, diff)
-        print_state(graph, i + 1, output)
+        LOGGER.info("Iteration %d ends. (diff=%s)", monitor.iterations, diff)
+        print_graph(monitor.iterations)
+
+    reason = monitor.reason
+    LOGGER.info(
+        "Stopped after %d iterations in %.1f seconds. (reason=%s)",
+        monitor.iterations,
+        monitor.elapsed,
+        reason.value if reason else None,
+    )
 
     # Print final state.
-    print_state(graph, "final", output)
+    print_graph("final")
+    return reason
+
+
+class ShardType(click.ParamType):
+    """A parameter type of shards written as ``i/n``."""
+
+    name = "shard"
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None,
+    ) -> tuple[int, int]:
+        if isinstance(value, tuple):
+            return value
+        try:
+            i, n = (int(v) for v in value.split("/"))
+        except ValueError:
+            self.fail(f"{value!r} is not in the form of i/n.", param, ctx)
+        if not 0 <= i < n:
+            self.fail(f"{value!r} must satisfy 0 <= i < n.", param, ctx)
+        return i, n
+
+
+class SizeType(click.ParamType):
+    """A parameter type of sizes in bytes with an optional unit suffix.
+
+    Units K, M, G and T are powers of 1024, e.g. ``512M`` or ``1.5G``.
+    """
+
+    name = "size"
+
+    _UNITS: Final = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+    def convert(
+        self,
+        value: Any,
+        param: click.Parameter | None,
+        ctx: click.Context | None,
+    ) -> int:
+        if isinstance(value, int):
+            return value
+        text = str(value).strip().upper().removesuffix("B")
+        unit = self._UNITS.get(text[-1:], 1)
+        if unit != 1:
+            text = text[:-1]
+        try:
+            size = int(float(text) * unit)
+        except ValueError:
+            self.fail(f"{value!r} is not a valid size.", param, ctx)
+        if size <= 0:
+            self.fail(f"{value!r} must be positive.", param, ctx)
+        return size
+
+
+def run_options(func: Callable) -> Callable:
+    """Decorator adding options which control how an algorithm runs."""
+    for option in reversed(
+        [
+            click.option(
+                "--loop", type=int, default=20, help="number of iteration."
+            ),
+            click.option(
+                "--threshold",
+                type=float,
+                default=1e-3,
+                help="absolute tolerance of updates.",
+            ),
+            click.option(
+                "--rtol",
+                type=float,
+                default=0.0,
+                help="tolerance of updates relative to the first update.",
+            ),
+            click.option(
+                "--patience",
+                type=click.IntRange(min=0),
+                default=0,
+                help="number of iterations with flat updates to stop, "
+                "0 disables it.",
+            ),
+            click.option(
+                "--time-budget",
+                type=click.FloatRange(min=0),
+                help="seconds the whole run may take.",
+            ),
+            click.option(
+                "--snapshot/--no-snapshot",
+                default=False,
+                help="restore the loaded graph from a snapshot if exists, "
+                "and store it otherwise. [Default: no-snapshot]",
+            ),
+            click.option(
+                "--snapshot-size",
+                type=click.IntRange(min=0),
+                default=4096,
+                help="maximum total size of snapshots in MiB.",
+            ),
+            click.option(
+                "--output",
+                default="-",
+                type=click.File("w"),
+                help="file path to store results. [Default: stdout]",
+            ),
+            click.option(
+                "--param",
+                multiple=True,
+                help="key and value pair of parameters corresponding to the "
+                "chosen algorithm, connected with '='.",
+            ),
+            click.option(
+                "--db",
+                type=click.Path(dir_okay=False, path_type=Path),
+                help="SQLite database to store results in instead of --output.",
+            ),
+            click.option(
+                "--top",
+                type=click.IntRange(min=1),
+                help="print only this number of the most anomalous reviewers.",
+            ),
+            click.option(
+                "--products/--no-products",
+                default=False,
+                help="print products with --top. [Default: no-products]",
+            ),
+            click.option(
+                "--warm-start",
+                type=click.File("r"),
+                help="output of a previous run to take initial anomalous "
+                "scores of reviewers from.",
+            ),
+        ]
+    ):
+        func = option(func)
+    return func
+
+
+def _reviewer_degree(
+    _ctx: click.Context, param: click.Parameter, value: int
+) -> int:
+    """Rejects a degree no reviewer in the dataset has.
+
+    Reviewers are identified by review IDs, so every reviewer of the Trip
+    Advisor archive has one review, and such a filter would load nothing.
+    """
+    if value > 1:
+        degree = max(dataset_stats().reviewer_degrees, default=0)
+        if value > degree:
+            raise click.BadParameter(
+                f"no reviewer has {value} reviews; reviewers are identified "
+                f"by review IDs and have at most {degree} reviews each, so "
+                "nothing would be loaded.",
+                param=param,
+            )
+    return value
+
+
+def load_options(func: Callable) -> Callable:
+    """Decorator adding options which control how the dataset is loaded."""
+    for option in reversed(
+        [
+            click.option(
+                "--since",
+                type=int,
+                help="load reviews posted on or after this date (yyyymmdd).",
+            ),
+            click.option(
+                "--until",
+                type=int,
+                help="load reviews posted on or before this date (yyyymmdd).",
+            ),
+            click.option(
+                "--shard",
+                type=ShardType(),
+                help="load only hotels in the i-th of n shards, given as i/n.",
+            ),
+            click.option(
+                "--sample-hotels",
+                type=click.IntRange(min=1),
+                help="load only this number of randomly sampled hotels.",
+            ),
+            click.option(
+                "--sample-fraction",
+                type=click.FloatRange(min=0, max=1, min_open=True),
+                help="load only this fraction of randomly sampled reviews.",
+            ),
+            click.option(
+                "--seed",
+                type=int,
+                default=0,
+                help="seed of random sampling.",
+            ),
+            click.option(
+                "--min-reviewer-degree",
+                type=click.IntRange(min=0),
+                default=0,
+                callback=_reviewer_degree,
+                help="drop reviewers posting fewer reviews than this; "
+                "reviewers are review IDs having one review each, so values "
+                "above 1 are rejected.",
+            ),
+            click.option(
+                "--min-product-degree",
+                type=click.IntRange(min=0),
+                default=0,
+                help="drop products receiving fewer reviews than this.",
+            ),
+            click.option(
+                "--k-core",
+                type=click.IntRange(min=0),
+                default=0,
+                callback=_reviewer_degree,
+                help="load only the k-core of the review graph; reviewers "
+                "are review IDs having one review each, so values above 1 "
+                "are rejected.",
+            ),
+            click.option(
+                "--memory-budget",
+                type=SizeType(),
+                help="memory loading may use, e.g. 512M or 8G; loading "
+                "switches to a low-memory mode or fails if it is projected "
+                "to exceed this.",
+            ),
+        ]
+    ):
+        func = option(func)
+    return func
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    "-m",
+    "--method",
+    type=click.Choice(list(ALGORITHMS.keys()), case_sensitive=False),
+    help="name of algorithm.",
+)
+@run_options
+@load_options
+@click.version_option(version("rgmining-tripadvisor-dataset"))
+@click.pass_context
+def main(
+    ctx: click.Context,
+    method: str | None,
+    loop: int,
+    threshold: float,
+    output: TextIO,
+    param: tuple[str, ...],
+    **kwargs: Any,
+) -> None:
+    """Evaluate a review graph mining algorithm with the Trip Advisor dataset."""
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    if ctx.invoked_subcommand is not None:
+        return
+    if method is None:
+        raise click.UsageError("Missing option '-m' / '--method'.", ctx)
+    snapshots = _snapshots(kwargs.pop("snapshot"), kwargs.pop("snapshot_size"))
+    _warm_start(kwargs)
+    with _store(kwargs.pop("db")) as store, _memory_budget():
+        run(
+            method,
+            loop,
+            threshold,
+            output,
+            param,
+            snapshots=snapshots,
+            store=store,
+            **kwargs,
+        )
+
+
+@contextmanager
+def _memory_budget() -> Iterator[None]:
+    """Reports loading beyond the memory budget without a traceback."""
+    try:
+        yield
+    except MemoryBudgetExceeded as e:
+        raise click.ClickException(f"Out of the memory budget: {e}") from e
+
+
+def _warm_start(kwargs: dict[str, Any]) -> None:
+    """Replaces the --warm-start file in given options with its scores."""
+    fp = kwargs.pop("warm_start")
+    if fp is not None:
+        kwargs["anomalous_scores"] = read_scores(fp)
+        LOGGER.info(
+            "Read initial scores of %d reviewers",
+            len(kwargs["anomalous_scores"]),
+        )
+
+
+def _store(path: Path | None) -> AbstractContextManager[ResultStore | None]:
+    """Returns a context of the result store if a path is given."""
+    return ResultStore(path) if path else nullcontext()
+
+
+def _snapshots(enabled: bool, size: int) -> Snapshots | None:
+    """Returns the snapshot cache if enabled.
+
+    Args:
+      enabled: whether the snapshot cache is used.
+      size: the maximum total size of snapshots in MiB.
+    """
+    if not enabled:
+        return None
+    return Snapshots(cache_dir().joinpath("snapshots"), size * 1024 * 1024)
 
 
-@click.command()
+def _windows(
+    since: int, until: int, width: int, step: int
+) -> Iterator[tuple[int, int]]:
+    """Generates sliding windows covering a given period.
+
+    Args:
+      since: the first date of the period in yyyymmdd format.
+      until: the last date of the period in yyyymmdd format.
+      width: the number of days each window covers.
+      step: the number of days between the first dates of two windows.
+
+    Yields:
+      The first and last dates of each window in yyyymmdd format.
+    """
+    start = _to_date(since)
+    end = _to_date(until)
+    while start <= end:
+        last = start + timedelta(days=width - 1)
+        yield _from_date(start), _from_date(min(last, end))
+        if last >= end:
+            break
+        start += timedelta(days=step)
+
+
+def _to_date(value: int) -> date:
+    """Converts a date in yyyymmdd format to a date object."""
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+def _from_date(value: date) -> int:
+    """Converts a date object to a date in yyyymmdd format."""
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+@main.command()
 @click.option(
     "-m",
     "--method",
@@ -178,26 +668,226 @@ def run(
     required=True,
     help="name of algorithm.",
 )
-@click.option("--loop", type=int, default=20, help="number of iteration.")
-@click.option("--threshold", type=float, default=10 ^ -3, help="threshold.")
+@run_options
+@click.option(
+    "--width",
+    type=click.IntRange(min=1),
+    required=True,
+    help="number of days each window covers.",
+)
+@click.option(
+    "--step",
+    type=click.IntRange(min=1),
+    help="number of days windows slide by. [Default: width]",
+)
+@load_options
+def windows(
+    method: str,
+    loop: int,
+    threshold: float,
+    output: TextIO,
+    param: tuple[str, ...],
+    width: int,
+    step: int | None,
+    since: int | None,
+    until: int | None,
+    **kwargs: Any,
+) -> None:
+    """Run an algorithm over sliding windows of review dates.
+
+    Each window is loaded from the date index of the edge cache, and objects
+    in the output have a window field consisting of its first and last dates.
+    --since and --until specify the period the windows cover, which defaults
+    to the period of the whole dataset.
+    """
+    s = dataset_stats()
+    since = since or s.first_date
+    until = until or s.last_date
+    if since is None or until is None:
+        raise click.ClickException("The dataset has no dated reviews.")
+
+    snapshots = _snapshots(kwargs.pop("snapshot"), kwargs.pop("snapshot_size"))
+    _warm_start(kwargs)
+    with _store(kwargs.pop("db")) as store, _memory_budget():
+        for first, last in _windows(since, until, width, step or width):
+            LOGGER.info("Start window %d-%d.", first, last)
+            run(
+                method,
+                loop,
+                threshold,
+                output,
+                param,
+                label={"window": {"since": first, "until": last}},
+                snapshots=snapshots,
+                store=store,
+                since=first,
+                until=last,
+                **kwargs,
+            )
+
+
+@main.command()
+@click.argument("dest", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "--shard",
+    type=ShardType(),
+    help="export only hotels in the i-th of n shards, given as i/n.",
+)
+def export(dest: Path, shard: tuple[int, int] | None) -> None:
+    """Export the dataset, or a shard of it, as an edge cache to DEST."""
+    export_dataset(dest, shard)
+
+
+@main.command()
+@click.argument(
+    "shards",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
 @click.option(
     "--output",
-    default=sys.stdout,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="directory to store the merged dataset. [Default: the cache]",
+)
+def merge(shards: tuple[Path, ...], output: Path | None) -> None:
+    """Merge edge caches exported from shards into one dataset."""
+    merge_dataset(shards, output)
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", help="host name to listen.")
+@click.option("--port", type=int, default=8080, help="port number to listen.")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="number of worker processes executing runs concurrently.",
+)
+@click.option(
+    "--snapshot-size",
+    type=click.IntRange(min=0),
+    default=4096,
+    help="maximum total size of snapshots in MiB.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="directory where runs may write their outputs. "
+    "[Default: runs may not write files]",
+)
+def serve(
+    host: str,
+    port: int,
+    workers: int,
+    snapshot_size: int,
+    output_dir: Path | None,
+) -> None:
+    """Serve run requests with the dataset kept in memory.
+
+    See :mod:`tripadvisor.server` for the protocol.
+    """
+    # The server module depends on this module.
+    from tripadvisor.server import serve as start_server
+
+    start_server(
+        host, port, workers, _snapshots(True, snapshot_size), output_dir
+    )
+
+
+@main.command()
+@click.argument("source", type=click.File("r"))
+@click.argument("db", type=click.Path(dir_okay=False, path_type=Path))
+def index(source: TextIO, db: Path) -> None:
+    """Store JSON lines written by a run in a SQLite database DB."""
+    with ResultStore(db) as store:
+        n = store.import_jsonl(source)
+    LOGGER.info("Stored %d objects in %s", n, db)
+
+
+@main.command()
+@click.argument(
+    "db", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option("--reviewer", help="print scores of this reviewer.")
+@click.option("--product", help="print summaries of this product.")
+@click.option(
+    "--iteration",
+    help="print scores and summaries at this iteration, e.g. 7 or final.",
+)
+@click.option(
+    "--label",
+    default="",
+    help="label of results, i.e. JSON of additional fields such as windows.",
+)
+@click.option(
+    "--run",
+    type=int,
+    help="ID of the run to query. [Default: the latest run]",
+)
+@click.option(
+    "--output",
+    default="-",
     type=click.File("w"),
     help="file path to store results. [Default: stdout]",
 )
+def query(
+    db: Path,
+    reviewer: str | None,
+    product: str | None,
+    iteration: str | None,
+    label: str,
+    run: int | None,
+    output: TextIO,
+) -> None:
+    """Query results stored in a SQLite database DB.
+
+    Without any of --reviewer, --product and --iteration, stored runs and
+    their iterations and labels are printed.
+    """
+    with ResultStore(db) as store:
+        if reviewer is not None:
+            for i, score in store.trajectory(reviewer, label, run):
+                _dump({"iteration": i, "score": score}, output)
+        elif product is not None:
+            for i, summary in store.product_trajectory(product, label, run):
+                _dump({"iteration": i, "summary": summary}, output)
+        elif iteration is not None:
+            key = int(iteration) if iteration.isdigit() else iteration
+            for name, score in store.scores(key, label, run).items():
+                _dump({"reviewer_id": name, "score": score}, output)
+            for name, summary in store.summaries(key, label, run).items():
+                _dump({"product_id": name, "summary": summary}, output)
+        else:
+            for r in store.runs() if run is None else [run]:
+                for key in store.labels(r):
+                    _dump(
+                        {
+                            "run": r,
+                            "label": key,
+                            "iterations": store.iterations(key, r),
+                        },
+                        output,
+                    )
+
+
+def _dump(obj: Any, output: TextIO) -> None:
+    """Writes a JSON line."""
+    json.dump(obj, output)
+    output.write("\n")
+
+
+@main.command()
 @click.option(
-    "--param",
-    multiple=True,
-    help="key and value pair of parameters corresponding to the chosen algorithm, connected with '='.",
+    "--output",
+    default="-",
+    type=click.File("w"),
+    help="file path to store results. [Default: stdout]",
 )
-@click.version_option(version("rgmining-tripadvisor-dataset"))
-def main(
-    method: str, loop: int, threshold: float, output: TextIO, param: tuple[str]
-) -> None:
-    """Evaluate a review graph mining algorithm with the Trip Advisor dataset."""
-    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
-    run(method, loop, threshold, output, param)
+def stats(output: TextIO) -> None:
+    """Print statistics of the Trip Advisor dataset."""
+    json.dump(dataset_stats().to_json(), output, indent=2)
+    output.write("\n")
 
 
 __all__: Final = ["main"]
@@ -0,0 +1,182 @@
+#
+# convergence.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a controller deciding when iterations should stop."""
+
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import Final
+
+_FLATNESS: Final = 0.01
+"""Relative change of diffs below which they are judged as flat."""
+
+
+class StopReason(Enum):
+    """Reasons why iterations stopped."""
+
+    LOOP = "loop"
+    """The given number of iterations finished."""
+    CONVERGED = "converged"
+    """The update of an iteration became negligible."""
+    STALLED = "stalled"
+    """Updates stopped changing."""
+    OSCILLATING = "oscillating"
+    """Updates went up and down between the same values."""
+    TIME_BUDGET = "time_budget"
+    """The next iteration would not finish within the time budget."""
+
+
+class Convergence:
+    """A controller deciding when iterations of an algorithm should stop.
+
+    The controller records the diff returned by each ``update()`` call and
+    the duration of each iteration. Iterations stop when
+
+    * the given number of iterations finished,
+    * a diff is within ``atol + rtol * d0`` where ``d0`` is the first diff,
+    * each of the last *patience* diffs is within 1% of the previous one,
+      which is reported as stalled, or the last *patience* diffs went up
+      and down alternately and each of them is within 1% of the one two
+      iterations before, which is reported as oscillating; diffs rising
+      or falling steadily are never judged as either, or
+    * the next iteration is not expected to finish within the time budget,
+      which is estimated from the longest iteration so far.
+
+    Typical usage is ::
+
+        monitor = Convergence(loop)
+        while monitor.proceed():
+            if monitor.update(graph.update()):
+                break
+
+    Args:
+      loop: the maximum number of iterations.
+      atol: absolute tolerance of diffs.
+      rtol: tolerance of diffs relative to the first diff.
+      patience: the number of iterations with flat diffs to be judged as
+        stalled or oscillating, 0 disables the detection.
+      time_budget: wall-clock seconds the whole run may take, counted from
+        the creation of this controller (default: unlimited).
+      clock: a function returning the current time in seconds.
+    """
+
+    loop: Final[int]
+    atol: Final[float]
+    rtol: Final[float]
+    patience: Final[int]
+    time_budget: Final[float | None]
+
+    diffs: Final[list[float]]
+    """Diffs returned by iterations."""
+    durations: Final[list[float]]
+    """Wall-clock seconds each iteration took."""
+    reason: StopReason | None
+    """The reason why iterations stopped, None while they continue."""
+
+    def __init__(
+        self,
+        loop: int,
+        atol: float = 1e-3,
+        rtol: float = 0.0,
+        patience: int = 0,
+        time_budget: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.loop = loop
+        self.atol = atol
+        self.rtol = rtol
+        self.patience = patience
+        self.time_budget = time_budget
+        self.diffs = []
+        self.durations = []
+        self.reason = None
+        self._clock = clock
+        self._started = self._last = clock()
+
+    @property
+    def iterations(self) -> int:
+        """The number of finished iterations."""
+        return len(self.durations)
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds since this controller was created."""
+        return self._clock() - self._started
+
+    def proceed(self) -> bool:
+        """Decides whether the next iteration should run.
+
+        Returns:
+          True if the next iteration should run.
+        """
+        if self.reason is not None:
+            return False
+        if self.iterations >= self.loop:
+            self.reason = StopReason.LOOP
+            return False
+        if (
+            self.time_budget is not None
+            and self.durations
+            and self.elapsed + max(self.durations) > self.time_budget
+        ):
+            self.reason = StopReason.TIME_BUDGET
+            return False
+
+        self._last = self._clock()
+        return True
+
+    def update(self, diff: float | None) -> bool:
+        """Records the result of an iteration.
+
+        Args:
+          diff: the value returned by ``update()``, None if the algorithm
+            doesn't report diffs.
+
+        Returns:
+          True if iterations should stop because of the diffs.
+        """
+        self.durations.append(self._clock() - self._last)
+        if diff is None:
+            return False
+
+        self.diffs.append(diff)
+        if diff <= self.atol + self.rtol * self.diffs[0]:
+            self.reason = StopReason.CONVERGED
+        elif self.patience and len(self.diffs) > self.patience:
+            recent = self.diffs[-self.patience - 1 :]
+            if _flat(recent, 1):
+                self.reason = StopReason.STALLED
+            elif len(recent) > 2 and _alternating(recent) and _flat(recent, 2):
+                self.reason = StopReason.OSCILLATING
+        return self.reason is not None
+
+
+def _flat(values: list[float], lag: int) -> bool:
+    """Returns True if each value is close to the one *lag* before it."""
+    return all(
+        abs(b - a) <= _FLATNESS * abs(a) for a, b in zip(values, values[lag:])
+    )
+
+
+def _alternating(values: list[float]) -> bool:
+    """Returns True if given values go up and down alternately."""
+    steps = [b - a for a, b in zip(values, values[1:])]
+    return all(a * b < 0 for a, b in zip(steps, steps[1:]))
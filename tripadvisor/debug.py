@@ -20,9 +20,11 @@
 #
 """This module provides a debug function for the Trip Advisor Dataset."""
 
+import heapq
 import json
 import sys
-from typing import Protocol, TextIO, Any, TypeVar
+from collections.abc import Sequence
+from typing import Protocol, TextIO, Any, TypeVar, runtime_checkable
 
 
 class Reviewer(Protocol):
@@ -65,7 +67,65 @@ class Graph(Protocol[RT, PT]):
         """A list of products."""
 
 
-def print_state(g: Graph, i: int | str, output: TextIO = sys.stdout) -> None:
+@runtime_checkable
+class BulkScores(Protocol):
+    """An optional extension of :class:`Graph` returning scores in bulk.
+
+    Graphs storing scores in arrays can implement these methods so that
+    outputting a state takes one call instead of reading attributes of every
+    reviewer and product. Each method returns a pair of an ID table and
+    values aligned with it, e.g. ``scores[i]`` is the score of reviewer
+    ``ids[i]``. Values may be any sequence of floats such as arrays.
+    """
+
+    def reviewer_scores(self) -> tuple[Sequence[str], Sequence[float]]:
+        """Returns IDs of reviewers and their anomalous scores."""
+
+    def product_summaries(self) -> tuple[Sequence[str], Sequence[float]]:
+        """Returns IDs of products and their summaries as floats."""
+
+
+def reviewer_scores(g: Graph) -> tuple[Sequence[str], Sequence[float]]:
+    """Returns IDs of reviewers and their anomalous scores.
+
+    Uses :meth:`BulkScores.reviewer_scores` if the graph implements it, and
+    reads every reviewer otherwise.
+
+    Args:
+      g: Graph instance.
+
+    Returns:
+      A pair of reviewer IDs and scores aligned with them.
+    """
+    if isinstance(g, BulkScores):
+        return g.reviewer_scores()
+    reviewers = g.reviewers
+    return [r.name for r in reviewers], [r.anomalous_score for r in reviewers]
+
+
+def product_summaries(g: Graph) -> tuple[Sequence[str], Sequence[float]]:
+    """Returns IDs of products and their summaries as floats.
+
+    Uses :meth:`BulkScores.product_summaries` if the graph implements it,
+    and reads every product otherwise.
+
+    Args:
+      g: Graph instance.
+
+    Returns:
+      A pair of product IDs and summaries aligned with them.
+    """
+    if isinstance(g, BulkScores):
+        return g.product_summaries()
+    products = g.products
+    return [p.name for p in products], [
+        float(str(p.summary)) for p in products
+    ]
+
+
+def print_state(
+    g: Graph, i: int | str, output: TextIO = sys.stdout, **fields: Any
+) -> None:
     """Print a current state of a given graph.
 
     This method outputs a current of a graph as a set of json objects.
@@ -98,33 +158,95 @@ def print_state(g: Graph, i: int | str, output: TextIO = sys.stdout) -> None:
            }
         }
 
+    Additional keyword arguments are added to every object as fields next
+    to the iteration number. Graphs implementing :class:`BulkScores` are
+    read in bulk.
+
     Args:
       g: Graph instance.
       i: Iteration number.
       output: A writable object (default: sys.stdout).
+      fields: Additional fields.
     """
-    for r in g.reviewers:
-        json.dump(
-            {
-                "iteration": i,
-                "reviewer": {
-                    "reviewer_id": r.name,
-                    "score": r.anomalous_score,
-                },
+    for name, score in zip(*reviewer_scores(g)):
+        _print_reviewer(name, score, i, output, fields)
+
+    for name, summary in zip(*product_summaries(g)):
+        _print_product(name, summary, i, output, fields)
+
+
+def print_top(
+    g: Graph,
+    i: int | str,
+    k: int,
+    output: TextIO = sys.stdout,
+    products: bool = False,
+    **fields: Any,
+) -> None:
+    """Print the k most anomalous reviewers of a given graph.
+
+    This function outputs reviewer objects in the same format as
+    :func:`print_state`, but only for the k reviewers with the highest
+    anomalous scores, in descending order of the scores. Reviewers are
+    selected with a heap bounded by k, so that the cost doesn't depend on
+    sorting all reviewers.
+
+    Args:
+      g: Graph instance.
+      i: Iteration number.
+      k: The number of reviewers to be printed.
+      output: A writable object (default: sys.stdout).
+      products: If True, product objects are also printed.
+      fields: Additional fields.
+    """
+    names, scores = reviewer_scores(g)
+    for j in heapq.nlargest(k, range(len(scores)), key=scores.__getitem__):
+        _print_reviewer(names[j], scores[j], i, output, fields)
+
+    if products:
+        for name, summary in zip(*product_summaries(g)):
+            _print_product(name, summary, i, output, fields)
+
+
+def _print_reviewer(
+    name: str,
+    score: float,
+    i: int | str,
+    output: TextIO,
+    fields: dict[str, Any],
+) -> None:
+    """Print a reviewer object."""
+    json.dump(
+        {
+            "iteration": i,
+            **fields,
+            "reviewer": {
+                "reviewer_id": name,
+                "score": float(score),
             },
-            output,
-        )
-        output.write("\n")
-
-    for p in g.products:
-        json.dump(
-            {
-                "iteration": i,
-                "product": {
-                    "product_id": p.name,
-                    "summary": float(str(p.summary)),
-                },
+        },
+        output,
+    )
+    output.write("\n")
+
+
+def _print_product(
+    name: str,
+    summary: float,
+    i: int | str,
+    output: TextIO,
+    fields: dict[str, Any],
+) -> None:
+    """Print a product object."""
+    json.dump(
+        {
+            "iteration": i,
+            **fields,
+            "product": {
+                "product_id": name,
+                "summary": float(summary),
             },
-            output,
-        )
-        output.write("\n")
+        },
+        output,
+    )
+    output.write("\n")
@@ -0,0 +1,249 @@
+#
+# download.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a downloader fetching byte ranges in parallel.
+
+A single HTTP stream is often limited by the throughput of one TCP
+connection. :func:`download` splits a file into segments, fetches them
+concurrently over connections pooled by a :class:`requests.Session`, and
+writes each segment in place into a preallocated file. A failed segment is
+retried from the last byte written. Servers not supporting range requests,
+or not telling the size of the file, are read as a single stream.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Final
+
+import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+
+LOGGER = logging.getLogger(__name__)
+
+_CHUNK_SIZE: Final = 256 * 1024
+"""The number of bytes read from a response at a time."""
+
+_MIN_SEGMENT_SIZE: Final = 4 * 1024 * 1024
+"""The default smallest segment worth a separate request."""
+
+_CONTENT_RANGE: Final = re.compile(r"bytes 0-0/(\d+)")
+
+
+class IncompleteDownload(IOError):
+    """Raised when a segment cannot be fetched within the retries."""
+
+
+def download(
+    url: str,
+    path: Path,
+    *,
+    segments: int = 8,
+    min_segment_size: int = _MIN_SEGMENT_SIZE,
+    retries: int = 3,
+    backoff: float = 1.0,
+    timeout: float = 60.0,
+) -> Path:
+    """Downloads a file, fetching byte ranges in parallel if possible.
+
+    The file is written to ``<path>.part`` first and renamed to *path* once
+    it is complete, so that a partial download is never taken for the file.
+
+    Args:
+      url: URL of the file.
+      path: path where the file will be stored.
+      segments: the maximum number of segments fetched concurrently.
+      min_segment_size: the smallest size of a segment in bytes.
+      retries: the number of times each segment is retried.
+      backoff: seconds waited before the first retry, doubled every retry.
+      timeout: seconds to wait for the server to send data.
+
+    Returns:
+      The path of the downloaded file.
+
+    Raises:
+      requests.HTTPError: if the server responds with an error.
+      IncompleteDownload: if a segment cannot be fetched within the retries,
+        or a single stream ends before its announced length.
+    """
+    tmp = path.with_name(path.name + ".part")
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_maxsize=max(segments, 1))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        # Probing with a one-byte range tells whether ranges are supported
+        # and the size of the file at once.
+        res = session.get(
+            url, headers={"Range": "bytes=0-0"}, stream=True, timeout=timeout
+        )
+        res.raise_for_status()
+        m = _CONTENT_RANGE.fullmatch(res.headers.get("Content-Range", ""))
+        if res.status_code != 206 or m is None:
+            if res.status_code == 206:
+                # The response has only the first byte of a file of unknown
+                # size, so the whole file is requested without a range.
+                LOGGER.info(
+                    "The server doesn't tell the size, using one stream"
+                )
+                res.close()
+                res = session.get(url, stream=True, timeout=timeout)
+                res.raise_for_status()
+            else:
+                LOGGER.info(
+                    "The server doesn't support ranges, using one stream"
+                )
+            _stream(res, tmp)
+            tmp.replace(path)
+            return path
+        res.close()
+
+        size = int(m.group(1))
+        n = max(1, min(segments, size // max(min_segment_size, 1)))
+        bounds = [size * i // n for i in range(n + 1)]
+        with open(tmp, "wb") as f:
+            f.truncate(size)
+
+        LOGGER.info("Downloading %d bytes in %d segments", size, n)
+        lock = threading.Lock()
+        with (
+            tqdm(total=size, unit="B", unit_scale=True) as bar,
+            ThreadPoolExecutor(n) as pool,
+        ):
+
+            def progress(k: int) -> None:
+                with lock:
+                    bar.update(k)
+
+            futures = [
+                pool.submit(
+                    _fetch,
+                    session,
+                    url,
+                    tmp,
+                    start,
+                    end,
+                    progress,
+                    retries,
+                    backoff,
+                    timeout,
+                )
+                for start, end in zip(bounds, bounds[1:])
+                if start < end
+            ]
+            for future in futures:
+                future.result()
+
+    tmp.replace(path)
+    return path
+
+
+def _stream(res: requests.Response, path: Path) -> None:
+    """Writes the body of a response to a file.
+
+    Raises:
+      IncompleteDownload: if the body is shorter than its Content-Length.
+    """
+    # Content-Length of an encoded body is not the size of the decoded one.
+    length = (
+        None
+        if res.headers.get("Content-Encoding")
+        else int(res.headers.get("Content-Length", 0)) or None
+    )
+    written = 0
+    with res, open(path, "wb") as f:
+        with tqdm(total=length, unit="B", unit_scale=True) as bar:
+            for chunk in res.iter_content(_CHUNK_SIZE):
+                f.write(chunk)
+                written += len(chunk)
+                bar.update(len(chunk))
+    if length is not None and written != length:
+        raise IncompleteDownload(
+            f"received {written} of {length} bytes of {res.url}"
+        )
+
+
+def _fetch(
+    session: requests.Session,
+    url: str,
+    path: Path,
+    start: int,
+    end: int,
+    progress: Callable[[int], None],
+    retries: int,
+    backoff: float,
+    timeout: float,
+) -> None:
+    """Fetches bytes [start, end) of a file into the same range of a file.
+
+    Args:
+      session: the session sending requests.
+      url: URL of the file.
+      path: the preallocated file the bytes are written to.
+      start: the first byte of the segment.
+      end: the byte after the last one of the segment.
+      progress: a function called with the number of bytes written.
+      retries: the number of times the segment is retried.
+      backoff: seconds waited before the first retry.
+      timeout: seconds to wait for the server to send data.
+    """
+    pos = start
+    for attempt in range(retries + 1):
+        try:
+            with (
+                session.get(
+                    url,
+                    headers={"Range": f"bytes={pos}-{end - 1}"},
+                    stream=True,
+                    timeout=timeout,
+                ) as res,
+                open(path, "r+b") as f,
+            ):
+                res.raise_for_status()
+                if res.status_code != 206:
+                    raise IncompleteDownload(
+                        f"the server ignored the range {pos}-{end - 1}"
+                    )
+                f.seek(pos)
+                for chunk in res.iter_content(_CHUNK_SIZE):
+                    chunk = chunk[: end - pos]
+                    f.write(chunk)
+                    pos += len(chunk)
+                    progress(len(chunk))
+            if pos >= end:
+                return
+            error: Exception = IncompleteDownload(
+                f"the segment ended at {pos} before {end}"
+            )
+        except (requests.RequestException, IncompleteDownload) as e:
+            error = e
+        if attempt < retries:
+            LOGGER.warning(
+                "Retrying bytes %d-%d of %s: %s", pos, end - 1, url, error
+            )
+            time.sleep(backoff * 2**attempt)
+    raise IncompleteDownload(
+        f"failed to fetch bytes {pos}-{end - 1} of {url}"
+    ) from error
@@ -20,27 +20,44 @@
 #
 """This module provides a function to load the Trip Advisor dataset."""
 
+import asyncio
+import functools
 import json
 import logging
+import random
+import struct
+import sys
 import tarfile
-from collections.abc import Iterator
+import threading
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
 from contextlib import closing
-from datetime import datetime
-from typing import Any, BinaryIO, cast, Protocol, TypeVar
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, cast, Final, Protocol, TypeVar
 
-import requests
 from platformdirs import user_cache_path
 from tqdm import tqdm
 
+from tripadvisor import cache, memory, sampling, shared
+from tripadvisor.download import download
+
 LOGGER = logging.getLogger(__name__)
 
 DATASET_URL = "https://www.cs.virginia.edu/~hw5x/Data/LARA/TripAdvisor/TripAdvisorJson.tar.bz2"
 FILENAME = "TripAdvisorJson.tar.bz2"
+EDGES_DIRNAME = f"edges-v{cache.VERSION}"
 
-_DATE_FORMAT = "%B %d, %Y"
-"""Data format in the dataset.
-"""
+_ID_OVERHEAD: Final = sys.getsizeof("") + struct.calcsize("P")
+"""Memory an ID takes in a list of strings besides its characters."""
 
+T = TypeVar("T")
 RT = TypeVar("RT")
 PT = TypeVar("PT")
 
@@ -89,66 +106,538 @@ class Graph(Protocol[RT, PT]):
         """
 
 
-def reviews() -> Iterator[dict[str, Any]]:
-    """Load the Trip Advisor dataset."""
+def cache_dir() -> Path:
+    """Returns the directory where the dataset is cached."""
+    return user_cache_path("rgmining-tripadvisor-dataset", ensure_exists=True)
+
 
-    data_path = user_cache_path(
-        "rgmining-tripadvisor-dataset", ensure_exists=True
-    ).joinpath(FILENAME)
+def _archive() -> Path:
+    """Returns the path of the dataset archive, downloading it if necessary."""
+    data_path = cache_dir().joinpath(FILENAME)
     if not data_path.exists():
         LOGGER.info(
             "Not found review data locally, downloading them from %s...",
             DATASET_URL,
         )
 
-        res = requests.get(DATASET_URL, stream=True)
-        res.raise_for_status()
-        with open(data_path, "wb") as f:
-            for chunk in res.iter_content(chunk_size=32 * 1024):
-                f.write(chunk)
+        download(DATASET_URL, data_path)
 
         LOGGER.info("Downloaded review data are stored at %s", data_path)
 
+    return data_path
+
+
+def reviews(
+    shard: tuple[int, int] | None = None,
+    *,
+    sample_hotels: int | None = None,
+    sample_fraction: float | None = None,
+    seed: int = 0,
+) -> Iterator[dict[str, Any]]:
+    """Load the Trip Advisor dataset.
+
+    A sample of the dataset can be taken in the same pass over the archive;
+    see :mod:`tripadvisor.sampling` for the methods. Only sampled hotels
+    are kept in memory while sampling hotels, and they are yielded after
+    the whole archive has been read.
+
+    Args:
+      shard: if given, a pair of the index of a shard and the number of
+        shards; only hotels belonging to the shard are yielded.
+        See :func:`tripadvisor.cache.shard_of` for the partitioning.
+      sample_hotels: if given, only this number of hotels chosen by
+        reservoir sampling are yielded.
+      sample_fraction: if given, each review is kept with this probability,
+        and hotels without kept reviews are dropped.
+      seed: seed of the random number generator used for sampling.
+
+    Yields:
+      Hotel objects consisting of hotel information and reviews.
+    """
+    hotels: Iterable[dict[str, Any]] = _hotels(shard)
+    rng = random.Random(seed)
+    if sample_hotels is not None:
+        hotels = sampling.reservoir(hotels, sample_hotels, rng)
+    if sample_fraction is not None:
+        hotels = sampling.sample_reviews(hotels, sample_fraction, rng)
+    yield from hotels
+
+
+def _hotels(shard: tuple[int, int] | None) -> Iterator[dict[str, Any]]:
+    """Parses hotel objects in the archive; see :func:`reviews`.
+
+    Members are named ``<HotelID>.json``, so members of other shards are
+    skipped without being parsed. Members named otherwise are parsed to
+    find their shards.
+    """
+    data_path = _archive()
     with tarfile.open(data_path) as tar:
         LOGGER.info("Extracting review data from %s...", data_path)
         for info in tqdm(tar.getmembers()):
             if not info.isfile():
                 continue
+            name = PurePosixPath(info.name)
+            if (
+                shard is not None
+                and name.suffix == ".json"
+                and cache.shard_of(name.stem, shard[1]) != shard[0]
+            ):
+                continue
 
             with closing(cast(BinaryIO, tar.extractfile(info))) as fp:
-                yield json.load(fp)
-                return
+                obj = json.load(fp)
+            if (
+                shard is None
+                or cache.shard_of(str(obj["HotelInfo"]["HotelID"]), shard[1])
+                == shard[0]
+            ):
+                yield obj
+
+
+def _fingerprint(path: Path) -> dict[str, int]:
+    """Returns a fingerprint of a given file."""
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _edges_path(guard: memory.MemoryGuard | None = None) -> Path:
+    """Returns the path of the edge cache, building it if necessary.
+
+    The edge cache is rebuilt when the downloaded archive has been replaced
+    since the cache was built. Caches without a source, such as ones merged
+    from shards built on other machines, are always used.
+
+    Args:
+      guard: if given, building the edge cache fails once the memory usage
+        exceeds its budget.
+    """
+    path = cache_dir().joinpath(EDGES_DIRNAME)
+    meta = cache.read_meta(path)
+    archive = cache_dir().joinpath(FILENAME)
+    if meta is not None and (
+        meta["source"] is None
+        or not archive.exists()
+        or meta["source"] == _fingerprint(archive)
+    ):
+        return path
+
+    source = _fingerprint(_archive())
+    LOGGER.info("Building the edge cache at %s...", path)
+    return cache.build(reviews(), path, source, guard)
+
+
+def dataset() -> cache.Dataset:
+    """Load the Trip Advisor dataset as edge columns.
+
+    The first call parses the whole archive and stores its edges in the cache
+    directory. Subsequent calls memory-map the cached edges, and the opened
+    dataset is shared between calls.
+
+    Returns:
+      The dataset.
+    """
+    path = _edges_path()
+    # Another process may be replacing the cache with a newer one.
+    while (meta := cache.read_meta(path)) is None:
+        path = _edges_path()
+    return _open(path, meta["fingerprint"])
+
+
+@functools.lru_cache(maxsize=1)
+def _open(path: Path, _stamp: str) -> cache.Dataset:
+    """Opens an edge cache; the result is reused until the cache is rebuilt."""
+    return cache.open_dataset(path)
+
+
+def _low_memory(path: Path) -> cache.Dataset:
+    """Opens an edge cache without reading ID tables into memory.
+
+    The dataset shared between calls of :func:`dataset` is released.
+    """
+    _open.cache_clear()
+    return cache.open_dataset(path, lazy_ids=True)
+
+
+def _id_table_bytes(path: Path) -> int:
+    """Estimates memory the ID tables of an edge cache take once read."""
+    s = cache.read_stats(path)
+    size = sum(
+        path.joinpath(name).stat().st_size
+        for name in ("reviewers.txt", "products.txt")
+    )
+    return size + _ID_OVERHEAD * (s.reviewers + s.products)
+
+
+def export(path: Path, shard: tuple[int, int] | None = None) -> Path:
+    """Export the Trip Advisor dataset as an edge cache.
+
+    Exporting each shard on a different node and merging them with
+    :func:`merge` builds the same dataset as :func:`dataset`, while each
+    node parses only its own hotels.
+
+    Args:
+      path: directory where the edge cache will be stored.
+      shard: if given, a pair of the index of a shard and the number of
+        shards; only hotels belonging to the shard are exported.
+
+    Returns:
+      The path of the exported edge cache.
+    """
+    source = _fingerprint(_archive())
+    return cache.build(reviews(shard), path, source)
+
+
+def merge(paths: Iterable[Path], path: Path | None = None) -> Path:
+    """Merge edge caches exported from shards.
+
+    Args:
+      paths: directories of the exported edge caches.
+      path: directory where the merged cache will be stored
+        (default: the edge cache used by :func:`load`).
+
+    Returns:
+      The path of the merged edge cache.
+    """
+    return cache.merge(paths, path or cache_dir().joinpath(EDGES_DIRNAME))
 
 
-def load(graph: Graph) -> Graph:
+def share(name: str | None = None) -> shared.SharedDataset:
+    """Share the Trip Advisor dataset with other processes.
+
+    The edge cache is copied into a named shared-memory segment, which
+    other local processes open without copying by
+    :func:`tripadvisor.shared.attach`.
+
+    Args:
+      name: name of the segment (default: a random name).
+
+    Returns:
+      The shared dataset owning the segment.
+    """
+    return shared.SharedDataset.create(_edges_path(), name)
+
+
+def stats() -> cache.Stats:
+    """Statistics of the Trip Advisor dataset.
+
+    The statistics are computed while building the edge cache, and this
+    function only reads them.
+
+    Returns:
+      The statistics such as degree distributions and rating histograms.
+    """
+    return cache.read_stats(_edges_path())
+
+
+def load(
+    graph: Graph,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    shard: tuple[int, int] | None = None,
+    sample_hotels: int | None = None,
+    sample_fraction: float | None = None,
+    seed: int = 0,
+    min_reviewer_degree: int = 0,
+    min_product_degree: int = 0,
+    k_core: int = 0,
+    memory_budget: int | None = None,
+    anomalous_scores: Mapping[str, float] | None = None,
+    source: cache.Dataset | None = None,
+) -> Graph:
     """Load the Trip Advisor dataset to a given graph object.
 
+    Reviews can be limited to a period and a shard of hotels, sampled, and
+    reviewers and hotels with few reviews can be pruned before the graph is
+    built; the filters are applied in this order, and only reviewers and
+    hotels having surviving reviews are created in the graph.
+    See :meth:`tripadvisor.cache.Dataset.window`,
+    :func:`tripadvisor.cache.partition`, :mod:`tripadvisor.sampling` and
+    :func:`tripadvisor.cache.prune` for the filters.
+
     Args:
       graph: an instance of review graph.
+      since: load reviews posted on or after this date in yyyymmdd format.
+      until: load reviews posted on or before this date in yyyymmdd format.
+      shard: if given, a pair of the index of a shard and the number of
+        shards; only hotels belonging to the shard are loaded.
+      sample_hotels: if given, only this number of hotels chosen by
+        reservoir sampling are loaded.
+      sample_fraction: if given, only this fraction of reviews chosen
+        uniformly at random are loaded.
+      seed: seed of the random number generator used for sampling.
+      min_reviewer_degree: minimum number of reviews a reviewer must post.
+      min_product_degree: minimum number of reviews a hotel must receive.
+      k_core: order of the core of the review graph to be loaded,
+        0 loads the whole graph.
+      memory_budget: if given, the memory in bytes this process may use
+        while loading. When the usage is projected to exceed it, ID tables
+        are memory-mapped instead of being kept in memory.
+      anomalous_scores: initial anomalous scores of reviewers keyed by their
+        IDs, e.g. scores of a previous run read by
+        :func:`tripadvisor.results.read_scores`; reviewers not in it start
+        with the default score of the graph.
+      source: the dataset to be loaded instead of :func:`dataset`, e.g. one
+        attached by :func:`tripadvisor.shared.attach`.
 
     Returns:
       The graph instance *graph*.
+
+    Raises:
+      tripadvisor.memory.MemoryBudgetExceeded: if the usage is projected to
+        exceed *memory_budget* even without ID tables in memory, or exceeds
+        it while the edge cache is being built.
     """
-    R = {}  # Reviewers dict.
-    for obj in reviews():
-        target = obj["HotelInfo"]["HotelID"]
-        product = graph.new_product(name=target)
+    guard = None
+    if memory_budget is not None:
+        guard = memory.MemoryGuard(memory_budget)
+    if source is not None:
+        data = source
+    elif guard is None:
+        data = dataset()
+    else:
+        path = _edges_path(guard)
+        resident = _open.cache_info().currsize > 0
+        if guard.fits(0 if resident else _id_table_bytes(path)):
+            data = dataset()
+        else:
+            LOGGER.warning(
+                "The dataset is projected to exceed the memory budget, "
+                "switching to the low-memory mode."
+            )
+            data = _low_memory(path)
+    if guard is not None:
+        guard.reset()
+
+    edges = _select(
+        data,
+        since=since,
+        until=until,
+        shard=shard,
+        sample_hotels=sample_hotels,
+        sample_fraction=sample_fraction,
+        seed=seed,
+        min_reviewer_degree=min_reviewer_degree,
+        min_product_degree=min_product_degree,
+        k_core=k_core,
+    )
+    LOGGER.info("Loading %d of %d reviews...", len(edges), len(data))
+
+    total = len(edges)
+    reviewers: dict[int, Any] = {}
+    products: dict[int, Any] = {}
+    for n in range(0, total, memory.CHECK_INTERVAL):
+        if guard is not None and not guard.check(n, total):
+            if isinstance(data.reviewers, cache.IdTable):
+                raise memory.MemoryBudgetExceeded(guard.report(n, total))
+            LOGGER.warning(
+                "Loading is projected to exceed the memory budget after %d "
+                "reviews, switching to the low-memory mode.",
+                n,
+            )
+            data = _low_memory(data.path)
+            guard.reset(n)
+        _add_reviews(
+            graph,
+            data,
+            edges[n : n + memory.CHECK_INTERVAL],
+            reviewers,
+            products,
+            anomalous_scores,
+        )
 
-        for r in obj["Reviews"]:
-            name = r["ReviewID"]
-            score = float(r["Ratings"]["Overall"]) / 5.0
+    if guard is not None:
+        LOGGER.info(
+            "Peak memory usage while loading: %.1f MiB",
+            guard.peak / 1024 / 1024,
+        )
+    return graph
 
-            try:
-                date = int(
-                    datetime.strptime(r["Date"], _DATE_FORMAT).strftime(
-                        "%Y%m%d"
-                    )
-                )
-            except ValueError:
-                date = None
-
-            if name not in R:
-                R[name] = graph.new_reviewer(name=name)
-            graph.add_review(R[name], product, score, date)
 
-    return graph
+def _select(
+    data: cache.Dataset,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    shard: tuple[int, int] | None = None,
+    sample_hotels: int | None = None,
+    sample_fraction: float | None = None,
+    seed: int = 0,
+    min_reviewer_degree: int = 0,
+    min_product_degree: int = 0,
+    k_core: int = 0,
+) -> Sequence[int]:
+    """Selects edges to be loaded; see :func:`load` for the arguments."""
+    edges = (
+        None if since is None and until is None else data.window(since, until)
+    )
+    if shard is not None:
+        edges = cache.partition(data, shard, edges)
+    rng = random.Random(seed)
+    if sample_hotels is not None:
+        edges = sampling.sample_products(data, sample_hotels, rng, edges)
+    if sample_fraction is not None:
+        edges = sampling.sample_edges(data, sample_fraction, rng, edges)
+    return cache.prune(
+        data,
+        edges,
+        min_reviewer_degree=min_reviewer_degree,
+        min_product_degree=min_product_degree,
+        k_core=k_core,
+    )
+
+
+def _add_reviews(
+    graph: Graph,
+    data: cache.Dataset,
+    edges: Iterable[int],
+    reviewers: dict[int, Any],
+    products: dict[int, Any],
+    scores: Mapping[str, float] | None = None,
+) -> None:
+    """Adds given edges to a graph.
+
+    Args:
+      graph: an instance of review graph.
+      data: the dataset.
+      edges: indices of edges to be added.
+      reviewers: reviewer nodes created so far keyed by reviewer indices.
+      products: hotel nodes created so far keyed by hotel indices.
+      scores: initial anomalous scores of reviewers keyed by their IDs.
+    """
+    for i in edges:
+        r = data.reviewer[i]
+        p = data.product[i]
+        if p not in products:
+            products[p] = graph.new_product(name=data.products[p])
+        if r not in reviewers:
+            name = data.reviewers[r]
+            score = scores.get(name) if scores else None
+            reviewers[r] = (
+                graph.new_reviewer(name=name)
+                if score is None
+                # Graphs name the score parameter differently.
+                else graph.new_reviewer(name, score)
+            )
+        graph.add_review(
+            reviewers[r], products[p], data.score[i], data.date[i] or None
+        )
+
+
+async def areviews(
+    shard: tuple[int, int] | None = None, buffer: int = 16
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Load the Trip Advisor dataset without blocking the event loop.
+
+    This is an asynchronous counterpart of :func:`reviews`. Downloading,
+    decompressing and parsing run in a worker thread, which stops when
+    *buffer* hotels are waiting to be consumed.
+
+    Args:
+      shard: if given, a pair of the index of a shard and the number of
+        shards; only hotels belonging to the shard are yielded.
+      buffer: the maximum number of parsed hotels waiting to be consumed.
+
+    Yields:
+      Hotel objects consisting of hotel information and reviews.
+    """
+    async for obj in _in_thread(lambda: reviews(shard), buffer):
+        yield obj
+
+
+async def aload(
+    graph: Graph,
+    *,
+    batch_size: int = memory.CHECK_INTERVAL,
+    anomalous_scores: Mapping[str, float] | None = None,
+    source: cache.Dataset | None = None,
+    **options: Any,
+) -> AsyncGenerator[Sequence[int], None]:
+    """Load the Trip Advisor dataset to a graph without blocking the event loop.
+
+    This is an asynchronous counterpart of :func:`load`. Building or opening
+    the edge cache and selecting edges run in a worker thread, and edges are
+    then added to *graph* in batches, giving control back to the event loop
+    after each batch. The graph is completely loaded when the iteration ends.
+
+    Args:
+      graph: an instance of review graph.
+      batch_size: the number of edges added to the graph at a time.
+      anomalous_scores: initial anomalous scores of reviewers keyed by their
+        IDs; see :func:`load`.
+      source: the dataset to be loaded instead of :func:`dataset`.
+      options: keyword arguments of :func:`load` selecting edges, i.e.
+        ``since``, ``until``, ``shard``, ``sample_hotels``,
+        ``sample_fraction``, ``seed``, ``min_reviewer_degree``,
+        ``min_product_degree``, and ``k_core``.
+
+    Yields:
+      Indices of the edges of :func:`dataset` added by each batch.
+    """
+
+    def select() -> tuple[cache.Dataset, Sequence[int]]:
+        data = dataset() if source is None else source
+        return data, _select(data, **options)
+
+    data, edges = await asyncio.to_thread(select)
+    LOGGER.info("Loading %d of %d reviews...", len(edges), len(data))
+
+    reviewers: dict[int, Any] = {}
+    products: dict[int, Any] = {}
+    for n in range(0, len(edges), batch_size):
+        batch = edges[n : n + batch_size]
+        _add_reviews(graph, data, batch, reviewers, products, anomalous_scores)
+        yield batch
+        await asyncio.sleep(0)
+
+
+async def _in_thread(
+    func: Callable[[], Iterator[T]], buffer: int
+) -> AsyncGenerator[T, None]:
+    """Iterates an iterator in a worker thread with bounded buffering.
+
+    Args:
+      func: a function returning the iterator; it is called in the thread.
+      buffer: the maximum number of items waiting to be consumed.
+
+    Yields:
+      Items of the iterator.
+    """
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(buffer)
+    stop = threading.Event()
+
+    def put(item: tuple[bool, Any]) -> None:
+        asyncio.run_coroutine_threadsafe(items.put(item), loop).result()
+
+    def produce() -> None:
+        end: tuple[bool, Any] = (True, None)
+        try:
+            it = func()
+            try:
+                for v in it:
+                    if stop.is_set():
+                        break
+                    put((False, v))
+            finally:
+                if isinstance(it, Generator):
+                    it.close()
+        except BaseException as e:
+            end = (True, e)
+        put(end)
+
+    worker = loop.run_in_executor(None, produce)
+    done = False
+    try:
+        while not done:
+            done, v = await items.get()
+            if not done:
+                yield v
+            elif v is not None:
+                raise v
+    finally:
+        stop.set()
+        # Unblock the worker until it puts the end marker.
+        while not done:
+            done, _ = await items.get()
+        await worker
@@ -0,0 +1,169 @@
+#
+# memory.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a guard keeping loading within a memory budget.
+
+Memory usage is measured as the resident set size of this process. While a
+graph is being loaded, :class:`MemoryGuard` samples it periodically and
+projects the usage after loading all edges from the growth per edge so far.
+"""
+
+import os
+import sys
+from typing import Final
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+CHECK_INTERVAL: Final = 4096
+"""The number of edges loaded between two samples of memory usage."""
+
+_MIB: Final = 1024 * 1024
+
+
+def peak_rss() -> int:
+    """Returns the peak resident set size of this process in bytes.
+
+    Returns 0 if the platform doesn't report it.
+    """
+    if resource is None:  # pragma: no cover
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes while Linux reports KiB.
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def rss() -> int:
+    """Returns the current resident set size of this process in bytes.
+
+    Falls back to the peak resident set size if the platform doesn't report
+    the current one.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss()
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised when loading cannot fit in the memory budget."""
+
+
+class MemoryGuard:
+    """A monitor of memory usage while edges are being loaded.
+
+    Args:
+      budget: the memory budget in bytes.
+      interval: the number of edges loaded between two samples.
+    """
+
+    budget: Final[int]
+    interval: Final[int]
+
+    peak: int
+    """The largest resident set size sampled so far."""
+    projected: int
+    """The projected usage computed by the last check."""
+
+    def __init__(self, budget: int, interval: int = CHECK_INTERVAL) -> None:
+        self.budget = budget
+        self.interval = interval
+        self.peak = self.projected = 0
+        self.reset()
+
+    def _sample(self) -> int:
+        """Samples the current usage and updates the peak."""
+        now = rss()
+        self.peak = max(self.peak, now)
+        return now
+
+    def reset(self, done: int = 0) -> None:
+        """Restarts the projection from the current usage.
+
+        Args:
+          done: the number of edges loaded so far.
+        """
+        self._base = self._sample()
+        self._done = done
+
+    def fits(self, extra: int) -> bool:
+        """Checks whether allocating a given size keeps within the budget.
+
+        Args:
+          extra: the size to be allocated in bytes.
+
+        Returns:
+          True if the current usage plus *extra* is within the budget.
+        """
+        self.projected = self._sample() + extra
+        return self.projected <= self.budget
+
+    def check(self, done: int, total: int) -> bool:
+        """Checks whether loading all edges is projected to fit the budget.
+
+        The usage is sampled only every :attr:`interval` edges since the last
+        reset, and this method returns True between samples.
+
+        Args:
+          done: the number of edges loaded so far.
+          total: the number of edges to be loaded.
+
+        Returns:
+          False if the projected usage exceeds the budget.
+        """
+        if (done - self._done) % self.interval:
+            return True
+        now = self._sample()
+        self.projected = now
+        if done > self._done:
+            rate = (now - self._base) / (done - self._done)
+            self.projected += max(int(rate * (total - done)), 0)
+        return self.projected <= self.budget
+
+    def report(self, done: int, total: int) -> str:
+        """Returns a human readable report of the memory usage.
+
+        Args:
+          done: the number of edges loaded so far.
+          total: the number of edges to be loaded.
+        """
+        return (
+            f"loading {total} reviews is projected to use "
+            f"{self.projected / _MIB:.1f} MiB, exceeding the budget of "
+            f"{self.budget / _MIB:.1f} MiB even in the low-memory mode "
+            f"(loaded {done} reviews, current usage {rss() / _MIB:.1f} MiB, "
+            f"peak {self.peak / _MIB:.1f} MiB)"
+        )
+
+    def build_report(self, done: int) -> str:
+        """Returns a human readable report of building the edge cache.
+
+        Args:
+          done: the number of reviews parsed so far.
+        """
+        return (
+            f"building the edge cache used {self.projected / _MIB:.1f} MiB "
+            f"after parsing {done} reviews, exceeding the budget of "
+            f"{self.budget / _MIB:.1f} MiB "
+            f"(peak {self.peak / _MIB:.1f} MiB)"
+        )
@@ -0,0 +1,400 @@
+#
+# results.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides an indexed store of run outputs.
+
+Outputs of :func:`tripadvisor.debug.print_state` are JSON lines, which can
+only be queried by scanning the whole file. :class:`ResultStore` keeps the
+same objects in a SQLite database indexed by iteration and by reviewer or
+product ID, so that score trajectories of a reviewer or all scores at an
+iteration can be read directly.
+
+Iterations are stored as given, i.e. integers or ``"final"``. Additional
+fields such as windows are stored as a label, which is the JSON encoding of
+those fields or an empty string.
+
+Each :class:`ResultStore` writing outputs is given a new run ID, so that
+outputs of runs stored in the same database aren't mixed even if they have
+the same labels and iterations. Queries select the latest run by default.
+"""
+
+import heapq
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, TextIO
+
+from tripadvisor.debug import Graph, product_summaries, reviewer_scores
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS reviewers (
+    run INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    iteration NOT NULL,
+    reviewer_id TEXT NOT NULL,
+    score REAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    run INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    iteration NOT NULL,
+    product_id TEXT NOT NULL,
+    summary REAL
+);
+"""
+
+_INDICES: Final = """
+CREATE INDEX IF NOT EXISTS reviewers_iteration
+    ON reviewers (run, label, iteration);
+CREATE INDEX IF NOT EXISTS reviewers_id ON reviewers (reviewer_id, run);
+CREATE INDEX IF NOT EXISTS products_iteration
+    ON products (run, label, iteration);
+CREATE INDEX IF NOT EXISTS products_id ON products (product_id, run);
+"""
+
+_VALUES: Final = {"reviewers": "score", "products": "summary"}
+"""Value columns of tables."""
+
+_BATCH_SIZE: Final = 100_000
+"""The number of rows imported at a time."""
+
+Iteration = int | str
+"""Type of iteration numbers."""
+
+
+def _label(fields: dict[str, Any]) -> str:
+    """Encodes additional fields as a label."""
+    return json.dumps(fields, sort_keys=True) if fields else ""
+
+
+def read_scores(fp: TextIO) -> dict[str, float]:
+    """Reads anomalous scores of reviewers from the output of a run.
+
+    Objects written by :func:`tripadvisor.debug.print_state` or
+    :func:`tripadvisor.debug.print_top` are read in order, and the last score
+    of each reviewer, i.e. the final one of a complete output, is returned.
+    Product objects are ignored.
+
+    Args:
+      fp: a readable object of JSON lines.
+
+    Returns:
+      A dict mapping reviewer IDs to their scores, which can be passed to
+      :func:`tripadvisor.load` to warm-start another run.
+    """
+    scores: dict[str, float] = {}
+    for line in fp:
+        if not line.strip():
+            continue
+        reviewer = json.loads(line).get("reviewer")
+        if reviewer is not None:
+            scores[reviewer["reviewer_id"]] = float(reviewer["score"])
+    return scores
+
+
+class ResultStore:
+    """A SQLite database storing scores and summaries of runs.
+
+    Indices are created when the store is closed, so that writing doesn't
+    pay for maintaining them. Use the store as a context manager to close it.
+
+    Outputs written through the store are stored as a new run, whose ID is
+    allocated by the first write.
+
+    Args:
+      path: path of the database file.
+    """
+
+    _conn: Final[sqlite3.Connection]
+
+    def __init__(self, path: Path | str) -> None:
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._run: int | None = None
+
+    @property
+    def run(self) -> int | None:
+        """ID of the run written by this store, None before writing."""
+        return self._run
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Creates indices and closes the database."""
+        self._conn.executescript(_INDICES)
+        self._conn.commit()
+        self._conn.close()
+
+    def _new_run(self) -> int:
+        """Returns the run ID of this store allocating it if necessary."""
+        if self._run is None:
+            cur = self._conn.execute("INSERT INTO runs DEFAULT VALUES")
+            assert cur.lastrowid is not None
+            self._run = cur.lastrowid
+        return self._run
+
+    def write_state(
+        self,
+        g: Graph,
+        i: Iteration,
+        top: int | None = None,
+        products: bool = True,
+        **fields: Any,
+    ) -> None:
+        """Stores a current state of a given graph.
+
+        Args:
+          g: Graph instance.
+          i: Iteration number.
+          top: if given, only this number of the most anomalous reviewers are
+            stored.
+          products: if True, summaries of products are stored.
+          fields: Additional fields.
+        """
+        run = self._new_run()
+        label = _label(fields)
+        names, scores = reviewer_scores(g)
+        selected: Iterable[int] = range(len(names))
+        if top is not None:
+            selected = heapq.nlargest(top, selected, key=scores.__getitem__)
+        self._conn.executemany(
+            "INSERT INTO reviewers VALUES (?, ?, ?, ?, ?)",
+            ((run, label, i, names[j], float(scores[j])) for j in selected),
+        )
+        if products:
+            self._conn.executemany(
+                "INSERT INTO products VALUES (?, ?, ?, ?, ?)",
+                (
+                    (run, label, i, name, float(summary))
+                    for name, summary in zip(*product_summaries(g))
+                ),
+            )
+        self._conn.commit()
+
+    def import_jsonl(self, fp: TextIO) -> int:
+        """Imports objects written by :func:`tripadvisor.debug.print_state`.
+
+        Rows are inserted and committed in batches, so that memory usage
+        doesn't grow with the size of the input.
+
+        Args:
+          fp: a readable object of JSON lines.
+
+        Returns:
+          The number of imported objects.
+        """
+        n = 0
+        run = self._new_run()
+        reviewers: list[tuple[int, str, Iteration, str, float]] = []
+        products: list[tuple[int, str, Iteration, str, float]] = []
+
+        def flush() -> None:
+            self._conn.executemany(
+                "INSERT INTO reviewers VALUES (?, ?, ?, ?, ?)", reviewers
+            )
+            self._conn.executemany(
+                "INSERT INTO products VALUES (?, ?, ?, ?, ?)", products
+            )
+            self._conn.commit()
+            reviewers.clear()
+            products.clear()
+
+        for line in fp:
+            if not line.strip():
+                continue
+            obj = json.loads(line)
+            reviewer = obj.pop("reviewer", None)
+            product = obj.pop("product", None)
+            i = obj.pop("iteration")
+            label = _label(obj)
+            if reviewer is not None:
+                reviewers.append(
+                    (run, label, i, reviewer["reviewer_id"], reviewer["score"])
+                )
+            if product is not None:
+                products.append(
+                    (run, label, i, product["product_id"], product["summary"])
+                )
+            n += 1
+            if len(reviewers) + len(products) >= _BATCH_SIZE:
+                flush()
+        flush()
+        return n
+
+    def runs(self) -> list[int]:
+        """Returns IDs of stored runs in the stored order."""
+        return [
+            run
+            for (run,) in self._conn.execute("SELECT id FROM runs ORDER BY id")
+        ]
+
+    def iterations(
+        self, label: str = "", run: int | None = None
+    ) -> list[Iteration]:
+        """Returns iterations stored with a given label.
+
+        Args:
+          label: label of outputs.
+          run: ID of the run, None selects the latest one.
+        """
+        return [
+            i
+            for (i,) in self._conn.execute(
+                "SELECT iteration FROM reviewers WHERE run = ? AND label = ?"
+                " GROUP BY iteration ORDER BY min(rowid)",
+                (self._select_run(run), label),
+            )
+        ]
+
+    def labels(self, run: int | None = None) -> list[str]:
+        """Returns labels of stored outputs.
+
+        Args:
+          run: ID of the run, None selects the latest one.
+        """
+        return [
+            v
+            for (v,) in self._conn.execute(
+                "SELECT label FROM reviewers WHERE run = ?"
+                " GROUP BY label ORDER BY min(rowid)",
+                (self._select_run(run),),
+            )
+        ]
+
+    def scores(
+        self, i: Iteration, label: str = "", run: int | None = None
+    ) -> dict[str, float]:
+        """Returns anomalous scores of reviewers at a given iteration.
+
+        Args:
+          i: Iteration number.
+          label: label of outputs.
+          run: ID of the run, None selects the latest one.
+        """
+        return dict(
+            self._conn.execute(
+                "SELECT reviewer_id, score FROM reviewers"
+                " WHERE run = ? AND label = ? AND iteration = ?",
+                (self._select_run(run), label, i),
+            )
+        )
+
+    def summaries(
+        self, i: Iteration, label: str = "", run: int | None = None
+    ) -> dict[str, float]:
+        """Returns summaries of products at a given iteration.
+
+        Args:
+          i: Iteration number.
+          label: label of outputs.
+          run: ID of the run, None selects the latest one.
+        """
+        return dict(
+            self._conn.execute(
+                "SELECT product_id, summary FROM products"
+                " WHERE run = ? AND label = ? AND iteration = ?",
+                (self._select_run(run), label, i),
+            )
+        )
+
+    def trajectory(
+        self, reviewer_id: str, label: str | None = "", run: int | None = None
+    ) -> list[tuple[Iteration, float]]:
+        """Returns anomalous scores of a reviewer over iterations.
+
+        Args:
+          reviewer_id: ID of the reviewer.
+          label: label of outputs, None selects all labels.
+          run: ID of the run, None selects the latest one.
+
+        Returns:
+          A list of pairs of an iteration and the score in the stored order.
+        """
+        return [
+            (i, score)
+            for _, i, score in self._select(
+                "reviewers", "reviewer_id", reviewer_id, label, run
+            )
+        ]
+
+    def product_trajectory(
+        self, product_id: str, label: str | None = "", run: int | None = None
+    ) -> list[tuple[Iteration, float]]:
+        """Returns summaries of a product over iterations.
+
+        Args:
+          product_id: ID of the product.
+          label: label of outputs, None selects all labels.
+          run: ID of the run, None selects the latest one.
+
+        Returns:
+          A list of pairs of an iteration and the summary in the stored order.
+        """
+        return [
+            (i, summary)
+            for _, i, summary in self._select(
+                "products", "product_id", product_id, label, run
+            )
+        ]
+
+    def _select_run(self, run: int | None) -> int | None:
+        """Returns a given run ID or the latest one if it's None."""
+        if run is not None:
+            return run
+        latest: int | None = self._conn.execute(
+            "SELECT max(id) FROM runs"
+        ).fetchone()[0]
+        return latest
+
+    def _select(
+        self,
+        table: str,
+        column: str,
+        value: str,
+        label: str | None,
+        run: int | None,
+    ) -> Iterator[tuple[str, Iteration, float]]:
+        """Selects rows of a given ID using the ID index."""
+        query = (
+            f"SELECT label, iteration, {_VALUES[table]} FROM {table}"
+            f" WHERE {column} = ? AND run = ?"
+        )
+        params: tuple[Any, ...] = (value, self._select_run(run))
+        if label is not None:
+            query += " AND label = ?"
+            params += (label,)
+        return iter(self._conn.execute(query + " ORDER BY rowid", params))
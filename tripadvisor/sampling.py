@@ -0,0 +1,144 @@
+#
+# sampling.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides seeded sampling of hotels and reviews.
+
+Samples are taken in one pass over the hotels or edges, and keep their
+original order. Every function takes a :class:`random.Random`, so that
+the same seed selects the same sample.
+"""
+
+import random
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, TypeVar
+
+from tripadvisor.cache import Dataset
+
+T = TypeVar("T")
+
+
+def reservoir(items: Iterable[T], k: int, rng: random.Random) -> list[T]:
+    """Selects k items uniformly at random by reservoir sampling.
+
+    Only the k selected items are kept while *items* is being consumed.
+
+    Args:
+      items: items to be sampled.
+      k: the number of items to be selected.
+      rng: random number generator.
+
+    Returns:
+      The selected items in the order of *items*, or all items if there are
+      k items or fewer.
+    """
+    selected: list[tuple[int, T]] = []
+    for i, v in enumerate(items):
+        if i < k:
+            selected.append((i, v))
+        else:
+            j = rng.randrange(i + 1)
+            if j < k:
+                selected[j] = (i, v)
+    selected.sort(key=lambda e: e[0])
+    return [v for _, v in selected]
+
+
+def sample_reviews(
+    hotels: Iterable[dict[str, Any]], fraction: float, rng: random.Random
+) -> Iterator[dict[str, Any]]:
+    """Selects each review of hotel objects with a given probability.
+
+    The number of reviews is unknown while hotels are streamed, so reviews
+    are selected independently instead of by reservoir sampling. Hotels
+    without selected reviews are dropped.
+
+    Args:
+      hotels: hotel objects in the raw dataset format.
+      fraction: probability that a review is selected.
+      rng: random number generator.
+
+    Yields:
+      Hotel objects having only the selected reviews.
+    """
+    for obj in hotels:
+        selected = [r for r in obj["Reviews"] if rng.random() < fraction]
+        if selected:
+            yield {**obj, "Reviews": selected}
+
+
+def sample_products(
+    data: Dataset,
+    k: int,
+    rng: random.Random,
+    edges: Sequence[int] | None = None,
+) -> Sequence[int]:
+    """Selects edges of k hotels chosen by reservoir sampling.
+
+    Hotels are sampled among those having the given edges, in the order of
+    their first edges.
+
+    Args:
+      data: the dataset.
+      k: the number of hotels to be selected.
+      rng: random number generator.
+      edges: indices of edges to be sampled (default: all edges).
+
+    Returns:
+      Indices of edges of the selected hotels in the given order.
+    """
+    selected: Sequence[int] = range(len(data)) if edges is None else edges
+    seen = bytearray(len(data.products))
+
+    def candidates() -> Iterator[int]:
+        for i in selected:
+            p = data.product[i]
+            if not seen[p]:
+                seen[p] = 1
+                yield p
+
+    chosen = bytearray(len(data.products))
+    for p in reservoir(candidates(), k, rng):
+        chosen[p] = 1
+    return array("I", (i for i in selected if chosen[data.product[i]]))
+
+
+def sample_edges(
+    data: Dataset,
+    fraction: float,
+    rng: random.Random,
+    edges: Sequence[int] | None = None,
+) -> Sequence[int]:
+    """Selects a given fraction of edges uniformly at random.
+
+    Args:
+      data: the dataset.
+      fraction: the fraction of edges to be selected.
+      rng: random number generator.
+      edges: indices of edges to be sampled (default: all edges).
+
+    Returns:
+      Indices of the selected edges in the given order.
+    """
+    selected: Sequence[int] = range(len(data)) if edges is None else edges
+    k = round(len(selected) * fraction)
+    return array(
+        "I", (selected[j] for j in sorted(rng.sample(range(len(selected)), k)))
+    )
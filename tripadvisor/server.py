@@ -0,0 +1,447 @@
+#
+# server.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a local server running algorithms on request.
+
+The server loads the dataset once and keeps it resident, so that each run
+skips interpreter start-up, plugin imports, and dataset loading. Runs are
+executed in a pool of worker processes, so that they run in parallel
+regardless of the GIL. The dataset is shared with the workers through a
+shared-memory segment created by :func:`tripadvisor.share`, and each
+worker attaches it once when it starts; see :mod:`tripadvisor.shared`.
+
+It accepts the following requests:
+
+``GET /health``
+  returns ``{"status": "ok", "reviews": <the number of reviews>}``.
+
+``POST /run``
+  runs an algorithm. The body is a JSON object such as ::
+
+      {
+         "method": "rsd",
+         "params": {"theta": 0.1},
+         "loop": 20,
+         "options": {"since": 20080101, "k_core": 2}
+      }
+
+  where ``method`` is required, ``params`` are parameters of the algorithm,
+  ``options`` are keyword arguments of :func:`tripadvisor.load`, and the
+  other optional fields ``loop``, ``threshold``, ``rtol``, ``patience``,
+  ``time_budget``, ``top``, ``products``, and ``snapshot`` correspond to
+  the command line options. The response streams the output of
+  :func:`tripadvisor.cli.run` as JSON lines followed by a status object
+  ``{"status": "finished", "reason": <stop reason>}``, or
+  ``{"status": "failed", "error": <message>}`` if the run fails.
+  If the optional field ``output`` specifies a file path, the output is
+  written to the file instead and only the status object is returned.
+  The path is relative to the output directory given to the server, and
+  paths outside of it are rejected; without the directory, requests with
+  ``output`` are rejected.
+
+  If a worker process dies, e.g. killed for running out of memory, the
+  request is answered with the status ``503 Service Unavailable`` and
+  a failed status object, and the workers are restarted.
+"""
+
+import json
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Event, Lock
+from typing import Any, Final, TextIO
+
+from tripadvisor.cli import ALGORITHMS, run
+from tripadvisor.loader import share
+from tripadvisor.shared import SharedDataset, attach
+from tripadvisor.snapshot import Snapshots
+
+LOGGER = logging.getLogger(__name__)
+
+_QUEUE_SIZE: Final = 16
+"""The number of output chunks buffered for each run."""
+_CHUNK_SIZE: Final = 64 * 1024
+"""The number of characters sending a chunk of output."""
+_CHUNK_LINES: Final = 1000
+"""The number of lines sending a chunk of output."""
+
+_worker: SharedDataset | None = None
+"""The shared dataset attached by this process if it is a worker."""
+_snapshots: Snapshots | None = None
+"""Snapshot cache of this process if it is a worker."""
+
+
+@dataclass(frozen=True)
+class RunRequest:
+    """A request to run an algorithm."""
+
+    method: str
+    params: dict[str, float] = field(default_factory=dict)
+    loop: int = 20
+    threshold: float = 1e-3
+    rtol: float = 0.0
+    patience: int = 0
+    time_budget: float | None = None
+    top: int | None = None
+    products: bool = False
+    snapshot: bool = False
+    output: str | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, obj: Any) -> "RunRequest":
+        """Creates a request from a JSON object.
+
+        Raises:
+          ValueError: if the object is not a valid request.
+        """
+        if not isinstance(obj, dict):
+            raise ValueError("request must be a JSON object")
+        try:
+            req = cls(**obj)
+        except TypeError as e:
+            raise ValueError(str(e)) from e
+        if req.method not in ALGORITHMS:
+            raise ValueError(f"unknown method: {req.method}")
+        return req
+
+
+class _QueueWriter:
+    """A writable object sending chunks of complete lines to a queue.
+
+    Since the queue lives in another process, lines are buffered and sent
+    once they amount to :data:`_CHUNK_SIZE` characters or
+    :data:`_CHUNK_LINES` lines, or when flushed. Writing fails once
+    *cancelled* is set.
+    """
+
+    def __init__(self, q: "queue.Queue[str | None]", cancelled: Event) -> None:
+        self._queue = q
+        self._buffer: list[str] = []
+        self._size = 0
+        self._lines = 0
+        self._cancelled = cancelled
+
+    def write(self, s: str) -> int:
+        self._buffer.append(s)
+        self._size += len(s)
+        if s.endswith("\n"):
+            self._lines += 1
+            if self._size >= _CHUNK_SIZE or self._lines >= _CHUNK_LINES:
+                self.flush()
+        return len(s)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        # The event may live in another process, so it's checked per chunk.
+        if self._cancelled.is_set():
+            raise ConnectionAbortedError("the client has disconnected")
+        self._queue.put("".join(self._buffer))
+        self._buffer.clear()
+        self._size = 0
+        self._lines = 0
+
+
+class Server(ThreadingHTTPServer):
+    """A local HTTP server running algorithms with a worker pool.
+
+    Args:
+      address: a pair of the host and port to listen.
+      workers: the number of worker processes executing runs concurrently.
+      snapshots: snapshot cache used by runs requesting it.
+      output_dir: directory where runs may write their outputs
+        (default: runs may not write files).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int = 1,
+        snapshots: Snapshots | None = None,
+        output_dir: Path | None = None,
+    ) -> None:
+        self._resources = ExitStack()
+        try:
+            LOGGER.info("Loading the dataset...")
+            shared = self._resources.enter_context(share())
+            self.reviews = len(shared.dataset)
+            # Forking a process running threads isn't safe.
+            context = multiprocessing.get_context("spawn")
+            self.manager = self._resources.enter_context(context.Manager())
+            self._new_pool = partial(
+                ProcessPoolExecutor,
+                workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(shared.name, snapshots),
+            )
+            self._pool_lock = Lock()
+            self.pool = self._new_pool()
+            self._resources.callback(
+                lambda: self.pool.shutdown(cancel_futures=True)
+            )
+            self.output_dir = output_dir
+            super().__init__(address, _Handler)
+        except BaseException:
+            self._resources.close()
+            raise
+
+    def output_path(self, output: str) -> Path:
+        """Resolves a requested output file in the output directory.
+
+        Raises:
+          ValueError: if the file is not in the output directory.
+        """
+        if self.output_dir is None:
+            raise ValueError("the server doesn't write outputs to files")
+        root = self.output_dir.resolve()
+        path = root.joinpath(output).resolve()
+        if path == root or not path.is_relative_to(root):
+            raise ValueError(
+                f"output is not in the output directory: {output}"
+            )
+        return path
+
+    def restart(self, pool: ProcessPoolExecutor) -> None:
+        """Replaces a broken worker pool with a new one.
+
+        Args:
+          pool: the broken pool; nothing is done if it's already replaced.
+        """
+        with self._pool_lock:
+            if self.pool is not pool:
+                return
+            LOGGER.warning("A worker has died; restarting the workers...")
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._new_pool()
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Stops the workers and removes the shared dataset.
+        self._resources.close()
+
+
+def _init_worker(name: str, snapshots: Snapshots | None) -> None:
+    """Attaches the shared dataset in a worker process."""
+    global _worker, _snapshots
+    _worker = attach(name)
+    _snapshots = snapshots
+
+
+def _execute(req: RunRequest, output: TextIO) -> str | None:
+    """Runs an algorithm in a worker process.
+
+    Returns:
+      The reason why iterations stopped.
+    """
+    if _worker is None:
+        raise RuntimeError("this process is not a worker of a server")
+    options = dict(req.options)
+    if options.get("shard") is not None:
+        options["shard"] = tuple(options["shard"])
+    reason = run(
+        req.method,
+        req.loop,
+        req.threshold,
+        output,
+        tuple(f"{k}={v}" for k, v in req.params.items()),
+        top=req.top,
+        products=req.products,
+        rtol=req.rtol,
+        patience=req.patience,
+        time_budget=req.time_budget,
+        snapshots=_snapshots if req.snapshot else None,
+        source=_worker.dataset,
+        **options,
+    )
+    output.flush()
+    return reason.value if reason else None
+
+
+def _execute_to_file(req: RunRequest, path: Path) -> str | None:
+    """Runs an algorithm writing its output to a given file."""
+    with open(path, "w") as f:
+        return _execute(req, f)
+
+
+def _execute_to_queue(
+    req: RunRequest, lines: "queue.Queue[str | None]", cancelled: Event
+) -> str | None:
+    """Runs an algorithm sending its output lines to a queue."""
+    return _execute(req, _QueueWriter(lines, cancelled))  # type: ignore[arg-type]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """A request handler of :class:`Server`."""
+
+    server: Server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        self._send_json(
+            HTTPStatus.OK, {"status": "ok", "reviews": self.server.reviews}
+        )
+
+    def do_POST(self) -> None:
+        if self.path != "/run":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            req = RunRequest.from_json(json.loads(self.rfile.read(length)))
+            path = (
+                self.server.output_path(req.output)
+                if req.output is not None
+                else None
+            )
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+
+        pool = self.server.pool
+        if path is not None:
+            try:
+                future = pool.submit(_execute_to_file, req, path)
+            except BrokenProcessPool as e:
+                self._send_json(*self._broken(req, pool, e))
+                return
+            self._send_json(*self._status(req, pool, future))
+            return
+
+        # Proxies of the manager can be passed to worker processes.
+        lines: queue.Queue[str | None] = self.server.manager.Queue(_QUEUE_SIZE)
+        cancelled = self.server.manager.Event()
+        try:
+            future = pool.submit(_execute_to_queue, req, lines, cancelled)
+        except BrokenProcessPool as e:
+            self._send_json(*self._broken(req, pool, e))
+            return
+        future.add_done_callback(lambda _: lines.put(None))
+
+        # Waits for the first chunk so that a run whose worker dies before
+        # writing anything can be answered with an error status.
+        chunk = lines.get()
+        if chunk is None and isinstance(future.exception(), BrokenProcessPool):
+            self._send_json(*self._status(req, pool, future))
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            while chunk is not None:
+                self._send_chunk(chunk)
+                chunk = lines.get()
+            _, status = self._status(req, pool, future)
+            self._send_chunk(json.dumps(status) + "\n")
+            self._send_chunk("")
+        except (BrokenPipeError, ConnectionResetError):
+            LOGGER.info("The client of %s has disconnected", req)
+            cancelled.set()
+            while lines.get() is not None:
+                pass
+            self.close_connection = True
+
+    def _status(
+        self,
+        req: RunRequest,
+        pool: ProcessPoolExecutor,
+        future: "Future[str | None]",
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Waits for a run and returns the response status and object."""
+        try:
+            return HTTPStatus.OK, {
+                "status": "finished",
+                "reason": future.result(),
+            }
+        except BrokenProcessPool as e:
+            return self._broken(req, pool, e)
+        except Exception as e:
+            LOGGER.exception("Failed to run %s", req)
+            return HTTPStatus.OK, {"status": "failed", "error": str(e)}
+
+    def _broken(
+        self, req: RunRequest, pool: ProcessPoolExecutor, e: Exception
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Restarts a broken worker pool and returns the error response."""
+        LOGGER.error("Failed to run %s: %s", req, e)
+        self.server.restart(pool)
+        return HTTPStatus.SERVICE_UNAVAILABLE, {
+            "status": "failed",
+            "error": str(e),
+        }
+
+    def _send_chunk(self, data: str) -> None:
+        """Sends a chunk of a chunked response."""
+        body = data.encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(body), body))
+        self.wfile.flush()
+
+    def _send_json(self, status: HTTPStatus, obj: Any) -> None:
+        """Sends a JSON response."""
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        LOGGER.info("%s - " + format, self.address_string(), *args)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    workers: int = 1,
+    snapshots: Snapshots | None = None,
+    output_dir: Path | None = None,
+) -> None:
+    """Starts a server and serves requests until interrupted.
+
+    Args:
+      host: host name to listen.
+      port: port number to listen.
+      workers: the number of runs executed concurrently.
+      snapshots: snapshot cache used by runs requesting it.
+      output_dir: directory where runs may write their outputs
+        (default: runs may not write files).
+    """
+    with Server((host, port), workers, snapshots, output_dir) as server:
+        LOGGER.info("Serving on http://%s:%d", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.info("Shutting down...")
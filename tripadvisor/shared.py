@@ -0,0 +1,267 @@
+#
+# shared.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides the dataset shared between processes.
+
+:func:`tripadvisor.dataset` reads ID tables into the memory of each process.
+:meth:`SharedDataset.create` instead copies the edge columns, ID tables and
+their offset indices of an edge cache once into a named shared-memory
+segment, and :func:`attach` opens the segment from any local process
+without copying. ID tables of an attached dataset are :class:`IdTable`,
+and edge columns are memoryviews, which can also be wrapped by array
+libraries, e.g. ``numpy.frombuffer(data.reviewer, numpy.uint32)``.
+
+A typical usage with a process pool is ::
+
+    with tripadvisor.share() as shared:
+        with ProcessPoolExecutor(initializer=..., initargs=(shared.name,)):
+            ...
+
+where each worker calls ``attach(name)`` and passes its dataset to
+:func:`tripadvisor.load` as ``source``.
+
+The segment starts with the length of a JSON header as an unsigned 64-bit
+little-endian integer, followed by the header and the files of the edge
+cache aligned to 8 bytes. The header records the path and the fingerprint
+of the edge cache and the offset and size of each file. Since the cache may
+be rebuilt while the segment is alive, the fingerprint of an attached
+dataset is read from the header rather than the cache.
+"""
+
+import json
+import logging
+import struct
+import sys
+from collections.abc import Iterator, Sized
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, Literal, cast
+
+from tripadvisor.cache import Dataset, IdTable, read_meta
+
+LOGGER = logging.getLogger(__name__)
+
+_LENGTH: Final = struct.Struct("<Q")
+"""Format of the header length."""
+
+_ALIGNMENT: Final = 8
+
+_FILES: Final[dict[str, Literal["B", "I", "Q", "d"]]] = {
+    "reviewers.txt": "B",
+    "reviewers.idx": "Q",
+    "products.txt": "B",
+    "products.idx": "Q",
+    "reviewer.bin": "I",
+    "product.bin": "I",
+    "score.bin": "d",
+    "date.bin": "I",
+    "date_order.bin": "I",
+    "sorted_date.bin": "I",
+}
+"""Files of an edge cache stored in a segment and their array type codes."""
+
+
+def _align(n: int) -> int:
+    """Rounds up a given offset to the alignment."""
+    return (n + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SharedDataset:
+    """A dataset stored in a named shared-memory segment.
+
+    Use :meth:`create` or :func:`attach` instead of the constructor.
+    The segment is unmapped by :meth:`close`, and it is removed by
+    :meth:`unlink` once no process needs it any more; when used as a context
+    manager, the creator does both at the end. Views of the dataset,
+    including slices of its columns, must be dropped before closing.
+
+    Args:
+      shm: the shared-memory segment.
+      owner: whether this object created the segment.
+    """
+
+    owner: Final[bool]
+    dataset: Dataset
+    """The dataset viewing the segment."""
+
+    def __init__(self, shm: SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._views: list[memoryview[Any]] = []
+        self.owner = owner
+        self.dataset = self._view()
+
+    @property
+    def name(self) -> str:
+        """Name of the segment to be passed to :func:`attach`."""
+        return self._shm.name
+
+    @classmethod
+    def create(cls, path: Path, name: str | None = None) -> "SharedDataset":
+        """Copies an edge cache into a new shared-memory segment.
+
+        Args:
+          path: directory of the edge cache.
+          name: name of the segment (default: a random name).
+
+        Returns:
+          The dataset owning the segment.
+
+        Raises:
+          ValueError: if the edge cache isn't complete.
+        """
+        meta = read_meta(path)
+        if meta is None:
+            raise ValueError(f"{path} is not a complete edge cache")
+        files: dict[str, list[int]] = {}
+        end = 0
+        for file in _FILES:
+            size = path.joinpath(file).stat().st_size
+            files[file] = [end, size]
+            end = _align(end + size)
+        header = json.dumps(
+            {
+                "path": str(path),
+                "fingerprint": meta["fingerprint"],
+                "files": files,
+            }
+        ).encode()
+        start = _align(_LENGTH.size + len(header))
+
+        shm = SharedMemory(name, create=True, size=max(start + end, 1))
+        buf = cast(memoryview, shm.buf)
+        try:
+            _LENGTH.pack_into(buf, 0, len(header))
+            buf[_LENGTH.size : _LENGTH.size + len(header)] = header
+            for file, (offset, size) in files.items():
+                with (
+                    open(path.joinpath(file), "rb") as f,
+                    buf[start + offset : start + offset + size] as view,
+                ):
+                    read = 0
+                    while read < size:
+                        n = f.readinto(view[read:])
+                        if not n:
+                            raise EOFError(f"{file} has been truncated")
+                        read += n
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        LOGGER.info("Shared %s as %s (%d bytes)", path, shm.name, shm.size)
+        return cls(shm, owner=True)
+
+    def _view(self) -> Dataset:
+        """Creates a dataset viewing the segment."""
+        buf = cast(memoryview, self._shm.buf)
+        (length,) = _LENGTH.unpack_from(buf, 0)
+        header = json.loads(bytes(buf[_LENGTH.size : _LENGTH.size + length]))
+        start = _align(_LENGTH.size + length)
+
+        columns: dict[str, Any] = {}
+        for file, (offset, size) in header["files"].items():
+            view = buf[start + offset : start + offset + size]
+            self._views.append(view)
+            column = view.cast(_FILES[file])
+            self._views.append(column)
+            columns[file] = column
+
+        return Dataset(
+            path=Path(header["path"]),
+            reviewers=IdTable(
+                columns["reviewers.txt"], columns["reviewers.idx"]
+            ),
+            products=IdTable(columns["products.txt"], columns["products.idx"]),
+            reviewer=columns["reviewer.bin"],
+            product=columns["product.bin"],
+            score=columns["score.bin"],
+            date=columns["date.bin"],
+            date_order=columns["date_order.bin"],
+            sorted_date=columns["sorted_date.bin"],
+            digest=header["fingerprint"],
+        )
+
+    def close(self) -> None:
+        """Unmaps the segment from this process.
+
+        Raises:
+          BufferError: if views of the dataset are still referenced.
+        """
+        del self.dataset
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Removes the segment; processes attaching it can still use it."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def attach(name: str) -> SharedDataset:
+    """Opens a dataset in a shared-memory segment without copying it.
+
+    Args:
+      name: name of the segment, i.e. :attr:`SharedDataset.name`.
+
+    Returns:
+      The dataset viewing the segment; it doesn't remove the segment.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedDataset(SharedMemory(name, track=False), owner=False)
+    with _untracked():
+        return SharedDataset(SharedMemory(name), owner=False)
+
+
+@contextmanager
+def _untracked() -> Iterator[None]:
+    """Stops registering shared-memory segments to the resource tracker.
+
+    Before Python 3.13, attaching a segment registers it to the resource
+    tracker, which removes the segment when the process exits even though
+    the creator still uses it. Unregistering it afterwards doesn't help
+    either, because processes forked from the creator share the tracker
+    and would drop the registration of the creator.
+    """
+    register = resource_tracker.register
+    resource_tracker.register = _ignore
+    try:
+        yield
+    finally:
+        resource_tracker.register = register
+
+
+def _ignore(name: Sized, rtype: str) -> None:
+    """Ignores a resource to be registered."""
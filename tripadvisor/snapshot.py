@@ -0,0 +1,154 @@
+#
+# snapshot.py
+#
+# Copyright (c) 2026 Junpei Kawamoto
+#
+# This file is part of rgmining-tripadvisor-dataset.
+#
+# rgmining-tripadvisor-dataset is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# rgmining-tripadvisor-dataset is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""This module provides a cache of graphs the dataset has been loaded to.
+
+Loading the dataset into a graph calls ``new_reviewer`` and ``add_review``
+millions of times. A snapshot stores the pickled graph right after loading,
+keyed by the algorithm, its parameters, the loading options, and the
+fingerprint of the dataset, so that the next run with the same key can
+restore the graph instead of loading it again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Final
+
+LOGGER = logging.getLogger(__name__)
+
+_SUFFIX: Final = ".pickle"
+
+
+def snapshot_key(
+    method: str,
+    params: dict[str, float],
+    options: dict[str, Any],
+    fingerprint: str,
+) -> str:
+    """Computes the key of a snapshot.
+
+    Args:
+      method: name of the algorithm.
+      params: parameters of the algorithm.
+      options: keyword arguments passed to :func:`tripadvisor.load`.
+      fingerprint: fingerprint of the dataset.
+
+    Returns:
+      A hex digest identifying the snapshot.
+    """
+    obj = {
+        "method": method,
+        "params": params,
+        "options": options,
+        "fingerprint": fingerprint,
+    }
+    return hashlib.sha256(
+        json.dumps(obj, sort_keys=True, default=repr).encode()
+    ).hexdigest()
+
+
+class Snapshots:
+    """A directory of graph snapshots bounded by its total size.
+
+    When the total size exceeds the limit, the least recently used snapshots
+    are evicted.
+
+    Args:
+      path: directory where snapshots are stored.
+      max_bytes: the maximum total size of snapshots.
+    """
+
+    path: Final[Path]
+    max_bytes: Final[int]
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Any | None:
+        """Restores a snapshot.
+
+        Args:
+          key: key of the snapshot.
+
+        Returns:
+          The restored graph, or None if the snapshot doesn't exist.
+        """
+        file = self.path.joinpath(key + _SUFFIX)
+        try:
+            with open(file, "rb") as f:
+                graph = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+            LOGGER.warning("Discarding a broken snapshot %s: %s", file, e)
+            file.unlink(missing_ok=True)
+            return None
+
+        # Mark it as recently used.
+        os.utime(file)
+        LOGGER.info("Restored a snapshot from %s", file)
+        return graph
+
+    def put(self, key: str, graph: Any) -> None:
+        """Stores a snapshot and evicts old ones if necessary.
+
+        Args:
+          key: key of the snapshot.
+          graph: the graph to be stored.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self.path.joinpath(key + _SUFFIX)
+        # Each writer needs its own temporary file since concurrent runs in
+        # a server store snapshots of the same key from threads.
+        with tempfile.NamedTemporaryFile(
+            dir=self.path, prefix=file.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            tmp = Path(f.name)
+            try:
+                pickle.dump(graph, f, pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        tmp.replace(file)
+        LOGGER.info("Stored a snapshot at %s", file)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used snapshots until they fit the limit."""
+        files = []
+        for file in self.path.glob("*" + _SUFFIX):
+            try:
+                files.append((file.stat(), file))
+            except FileNotFoundError:
+                continue
+        files.sort(key=lambda v: v[0].st_mtime_ns, reverse=True)
+
+        total = 0
+        for st, file in files:
+            total += st.st_size
+            if total > self.max_bytes:
+                LOGGER.info("Evicting a snapshot %s", file)
+                file.unlink(missing_ok=True)